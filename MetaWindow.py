@@ -1,8 +1,10 @@
 import sys
+import ast
 import importlib
 import importlib.util
 from importlib.abc import MetaPathFinder
 import os
+import time
 import maya.api.OpenMaya as om
 from maya import cmds
 
@@ -22,8 +24,9 @@ class MetaWindowCmd(om.MPxCommand):
         super(MetaWindowCmd, self).__init__()
 
     def doIt(*args, **kwargs):
-        """ This is the function that is run once cmds.metaWindow() is called """
-        print("Dont use this command directly")
+        """ This is the function that is run once cmds.metaWindow() is called, it hot reloads the MetaWindow modules that changed on disk """
+        reloaded = finder.reload()
+        print(f"Reloaded {', '.join(reloaded)}" if reloaded else "Nothing to reload")
 
     @staticmethod
     def creator():
@@ -32,16 +35,145 @@ class MetaWindowCmd(om.MPxCommand):
 
 
 class MetaWindowModuleFinder(MetaPathFinder):
-    def find_spec(self, fullname, path=None, target=None):
-        """ find_spec concrete implementation, it tries to reload modules found if they are already loaded if not try to use maya's cmds.pluginInfo to scope for new modules"""
-        plugin_path = os.path.dirname(cmds.pluginInfo("MetaWindow", query=True, path=True))    # <- Find the plugin's folder path using maya's cmds.pluginInfo
-        location = os.path.normpath(f"{plugin_path}/MetaWindow/scripts/{fullname}.py")         # <- Find the module's path
+    """ This finder imports the modules stored in the plugin's scripts folder, it keeps an index of that folder so misses never reach the file system or maya """
+
+    REFRESH_INTERVAL = 1.0
+    """ Minimum time, in seconds, between two checks of the scripts folder's mtime """
+
+    def __init__(self, scripts_path=None):
+        self.scripts_path = scripts_path
+        """ The plugin's scripts folder, resolved through cmds.pluginInfo on first use if not given """
+
+        self.modules = {}
+        """ Index of the scripts folder, maps each module name to its file path """
+
+        self.stats = {"calls": 0, "hits": 0, "misses": 0, "refreshes": 0, "time": 0.0}
+        """ Number of find_spec calls, how they were answered, how many times the index was rebuilt and the total time spent in find_spec """
+
+        self.tracked = {}
+        """ Every module loaded by this finder or registered through track, maps each module name to its (file path, mtime, imported module names),
+            the imported module names are None until the next reload parses them """
+
+        self._mtime = None
+        self._checked = None
 
-        if not os.path.exists(location):     # <- If the path doesn't exist
-            return None                      # <- return nothing since there's nothing to be imported here
+    def invalidate_caches(self):
+        """ Called by importlib.invalidate_caches, forces the next lookup to check the scripts folder """
+        self._checked = None
 
-        spec = importlib.util.spec_from_file_location(fullname, location)  # <- if the path exists, build a spec object from the module name and file path
-        return spec                                                        # <- return the spec so the module builder will be able to build the module
+    def _refresh(self):
+        """ Rebuild the index if the scripts folder changed, the folder's mtime is checked at most once every REFRESH_INTERVAL seconds """
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < MetaWindowModuleFinder.REFRESH_INTERVAL:
+            return
+        self._checked = now
+
+        if self.scripts_path is None:
+            plugin_path = os.path.dirname(cmds.pluginInfo("MetaWindow", query=True, path=True))    # <- Find the plugin's folder path using maya's cmds.pluginInfo, only once
+            self.scripts_path = os.path.normpath(f"{plugin_path}/MetaWindow/scripts")
+
+        try:
+            mtime = os.stat(self.scripts_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:            # <- Nothing was added, removed or renamed since the last check
+            return
+
+        self._mtime = mtime
+        self.stats["refreshes"] += 1
+        self.modules = {} if mtime is None else {entry.name[:-3]: entry.path for entry in os.scandir(self.scripts_path) if entry.name.endswith(".py") and entry.is_file()}
+
+    def find_spec(self, fullname, path=None, target=None):
+        """ find_spec concrete implementation, it answers from the index of the plugin's scripts folder, the folder is found once with maya's cmds.pluginInfo """
+        start = time.perf_counter()
+        self.stats["calls"] += 1
+        try:
+            if path is not None or "." in fullname:     # <- The scripts are top level modules, submodules are never here
+                self.stats["misses"] += 1
+                return None
+
+            self._refresh()
+            location = self.modules.get(fullname)       # <- Find the module's path
+            if location is None:                        # <- If the module isn't indexed
+                self.stats["misses"] += 1
+                return None                             # <- return nothing since there's nothing to be imported here
+
+            try:
+                mtime = os.stat(location).st_mtime_ns
+            except OSError:                             # <- Removed since the folder was indexed
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            self.tracked[fullname] = location, mtime, None      # <- Its imports are only parsed by the next reload, never while importing
+            spec = importlib.util.spec_from_file_location(fullname, location)  # <- if the module is indexed, build a spec object from the module name and file path
+            return spec                                                        # <- return the spec so the module builder will be able to build the module
+        finally:
+            self.stats["time"] += time.perf_counter() - start
+
+    @staticmethod
+    def _imports(location):
+        """ The top level names of the modules imported by the file, a file that can't be read or parsed imports nothing """
+        try:
+            with open(location, "rb") as source:
+                tree = ast.parse(source.read(), location)
+        except (OSError, SyntaxError, ValueError):
+            return set()
+        imported = {alias.name.split(".")[0] for node in ast.walk(tree) if isinstance(node, ast.Import) for alias in node.names}
+        imported.update(node.module.split(".")[0] for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and node.module and not node.level)
+        return imported
+
+    def _track(self, name, location):
+        """ Record the module's file mtime, the names of the modules it imports are left for the next reload to parse """
+        self.tracked[name] = location, os.stat(location).st_mtime_ns, None
+
+    def track(self, name):
+        """ Include an already imported module, such as a user module defining inspected classes, in the hot reload graph """
+        self._track(name, sys.modules[name].__file__)
+
+    def reload(self):
+        """ Hot reload the tracked modules whose file changed along with every tracked module importing them, dependencies first,
+            then rebuild the open inspector panels whose schema changed, returns the reloaded module names in reload order """
+        def changed(location, mtime):
+            try:
+                return os.stat(location).st_mtime_ns != mtime
+            except OSError:
+                return False
+
+        for name, (location, mtime, imported) in list(self.tracked.items()):
+            if imported is None:
+                self.tracked[name] = location, mtime, self._imports(location)
+
+        stale = set()
+        pending = [name for name, (location, mtime, _) in self.tracked.items() if name in sys.modules and changed(location, mtime)]
+        while pending:                      # <- Spread the staleness to every module importing a stale module
+            name = pending.pop()
+            if name not in stale:
+                stale.add(name)
+                pending.extend(other for other, (_, _, imported) in self.tracked.items() if name in imported and other in sys.modules)
+
+        order = []
+        visiting = set()
+
+        def visit(name):                    # <- Depth first, so a module is always reloaded after the stale modules it imports
+            if name in visiting or name in order:
+                return
+            visiting.add(name)
+            for dependency in sorted(self.tracked[name][2] & stale):
+                visit(dependency)
+            order.append(name)
+
+        for name in sorted(stale):
+            visit(name)
+
+        for name in order:
+            importlib.reload(sys.modules[name])
+            self._track(name, self.tracked[name][0])
+
+        inspector = sys.modules.get("inspector")
+        if order and inspector:
+            inspector.refresh_panels()
+        return order
 
 
 finder = MetaWindowModuleFinder()
@@ -0,0 +1,859 @@
+import argparse
+import gc
+import importlib.util
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import weakref
+from array import array
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.normpath(f"{os.path.dirname(os.path.abspath(__file__))}/../scripts"))    # <- Make the scripts importable when running outside maya
+import arrays
+import backend
+import engine
+import inspector
+import plugs
+import presets
+import profiler
+import providers
+import thumbnails
+import widgets
+
+
+class Probe(engine.Widget, T=int):
+    """ Widget used only to populate synthetic schemas """
+    def __widget__(self, bind, default):
+        pass
+
+
+def build_hierarchy(depth: int, fields_per_class: int, groups: int = 8) -> type:
+    """ Build a synthetic class hierarchy, depth classes deep, each declaring fields_per_class annotated fields """
+    base = object
+    for level in range(depth):
+        members = {"__annotations__": {}}
+        for index in range(fields_per_class):
+            field_name = f"field_{level}_{index}"
+            members["__annotations__"][field_name] = Probe(field_name, f"Group {index % groups}" if index % groups else "")
+            members[field_name] = index
+        base = type(f"Level{level}", (base,), members)
+    return base
+
+
+def bench_reflection(depth: int = 10, fields_per_class: int = 50, number: int = 200) -> dict[str, float]:
+    """ Compare cold (schema compiled every time) against warm (schema cached) reflection extraction """
+    target = build_hierarchy(depth, fields_per_class)()
+
+    def cold():
+        engine.Schema.invalidate()
+        engine.Fragment.extract_reflection(target)
+
+    def warm():
+        engine.Fragment.extract_reflection(target)
+
+    results = {"cold": min(timeit.repeat(cold, number=number, repeat=3)) / number,
+               "warm": min(timeit.repeat(warm, number=number, repeat=3)) / number}
+    print(f"extract_reflection, {depth} classes x {fields_per_class} fields: cold {results['cold'] * 1e6:.1f}us, warm {results['warm'] * 1e6:.1f}us, {results['cold'] / results['warm']:.1f}x")
+    return results
+
+
+class PlainProp:
+    """ Target holding a plain attribute """
+    def __init__(self):
+        self.value = 0
+
+
+class PropertyProp:
+    """ Target holding a property backed attribute """
+    def __init__(self):
+        self._value = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class LoggedProp(PropertyProp):
+    """ Target overriding __setattr__, every write must go through it """
+    log = []
+
+    def __setattr__(self, name, value):
+        LoggedProp.log.append(name)
+        super().__setattr__(name, value)
+
+
+def bench_batch_set(count: int = 200, number: int = 2000) -> dict[str, float]:
+    """ Compare engine.batch_set against a per object setattr loop, for plain and property backed attributes """
+    results = {}
+    for prop_class in (PlainProp, PropertyProp):
+        targets = [prop_class() for _ in range(count)]
+
+        def loop():
+            for target in targets:
+                setattr(target, "value", 1)
+
+        def batch():
+            engine.batch_set(targets, "value", 1, same_class=True)
+
+        results[f"{prop_class.__name__}.setattr"] = min(timeit.repeat(loop, number=number, repeat=3)) / number
+        results[f"{prop_class.__name__}.batch_set"] = min(timeit.repeat(batch, number=number, repeat=3)) / number
+        print(f"{prop_class.__name__} x {count}: setattr {results[f'{prop_class.__name__}.setattr'] * 1e6:.1f}us, batch_set {results[f'{prop_class.__name__}.batch_set'] * 1e6:.1f}us")
+
+    engine.batch_set([LoggedProp() for _ in range(3)], "value", 2, same_class=True)
+    assert LoggedProp.log.count("value") == 3, "batch_set skipped the targets' __setattr__"
+    return results
+
+
+LIST_COMMANDS = ("textScrollList", "iconTextCheckBox", "deleteUI")
+""" Commands touching the list entries, they are the ones counted by bench_list_updates """
+
+
+def bench_list_updates(sizes=(10, 100, 1000, 10000)) -> dict[str, dict[int, int]]:
+    """ Count the list commands called by a single add and a single delete through a string box and a toggle shelf's buttons,
+        against rebuilding the widget from the edited value, a rebuild recreates every check box of the shelf, and sends every entry through the string box's single textScrollList call """
+    with backend.recording() as recorder:
+        results = {"string_box": {}, "string_box.rebuild": {}, "toggle_shelf": {}, "toggle_shelf.rebuild": {}}
+        counted = lambda: sum(recorder.calls[command] for command in LIST_COMMANDS)
+        for size in sizes:
+            names = [f"node_{i:06d}" for i in range(size)]
+            specs = {"string_box": widgets.StringBox("entries"), "toggle_shelf": widgets.ToggleShelf("entries")}
+            defaults = {"string_box": set(names), "toggle_shelf": dict.fromkeys(names, False)}
+            for name, spec in specs.items():
+                target = type("Entries", (object,), {"__annotations__": {"entries": spec}, "entries": defaults[name]})()
+                fragment = engine.Fragment.extract_reflection(target)[""][0]
+                layout = recorder.columnLayout()
+                fragment.build_widget()
+                removed = names[size // 2]
+                if name == "string_box":
+                    main_element = fragment.controls[0]
+                    add_element, = [control for control in recorder.children[recorder.parents[main_element]] if control != main_element]
+                    recorder.responses["ls"] = ["node_new"]
+                    recorder.controls[main_element]["selectItem"] = [removed]
+                    recorder.reset_calls()
+                    recorder.fire(add_element, "command")
+                    recorder.fire(main_element, "deleteKeyCommand")
+                else:
+                    layout_element, controls, _ = fragment.controls
+                    add_element, delete_element = recorder.children[recorder.children[recorder.parents[layout_element]][1]]
+                    recorder.responses["fileDialog2"] = ["new.tga"]
+                    recorder.fire(controls[removed], "cc", True)        # <- Check the entry, the delete button removes the checked ones
+                    recorder.reset_calls()
+                    recorder.fire(add_element, "command")
+                    recorder.fire(delete_element, "command")
+                results[name][size] = counted()
+
+                recorder.reset_calls()
+                recorder.deleteUI(layout)
+                layout = recorder.columnLayout()
+                fragment.build_widget()
+                results[f"{name}.rebuild"][size] = counted()
+                recorder.deleteUI(layout)
+            print(f"{size} entries, one add and one delete: string box {results['string_box'][size]} calls (rebuild {results['string_box.rebuild'][size]}), "
+                  f"toggle shelf {results['toggle_shelf'][size]} calls (rebuild {results['toggle_shelf.rebuild'][size]})")
+    return results
+
+
+WIDGET_SPECS = {
+    "Toggle":      (lambda i: widgets.Toggle(f"toggle {i}", f"Group {i % 8}"), False),
+    "TextField":   (lambda i: widgets.TextField(f"text {i}", f"Group {i % 8}"), "text"),
+    "Dropdown":    (lambda i: widgets.Dropdown(f"dropdown {i}", f"Group {i % 8}", choices=["a", "b", "c"]), "a"),
+    "IntSlider":   (lambda i: widgets.IntSlider(f"int {i}", f"Group {i % 8}", min=0, max=10), 5),
+    "FloatSlider": (lambda i: widgets.FloatSlider(f"float {i}", f"Group {i % 8}", min=0, max=1), 0.5),
+    "StringBox":   (lambda i: widgets.StringBox(f"nodes {i}", f"Group {i % 8}"), {"pCube1", "pSphere1"}),
+    "MVecField":   (lambda i: widgets.MVecField(f"vector {i}", f"Group {i % 8}"), backend.MVector(1, 2, 3)),
+    "ToggleShelf": (lambda i: widgets.ToggleShelf(f"files {i}", f"Group {i % 8}"), {"a.tga": True, "b.tga": False}),
+}
+""" Factory and default value of every widget, used to populate synthetic panels """
+
+
+def build_panel_class(size: int) -> type:
+    """ Build a synthetic class with size annotated fields, cycling through every widget """
+    members = {"__annotations__": {}}
+    factories = list(WIDGET_SPECS.values())
+    for index in range(size):
+        factory, default = factories[index % len(factories)]
+        members["__annotations__"][f"field_{index}"] = factory(index)
+        members[f"field_{index}"] = default
+    return type(f"Panel{size}", (object,), members)
+
+
+def bench_panel(sizes=(10, 100, 1000), number: int = 5) -> dict[str, dict]:
+    """ Time create_panel, extract_reflection and every widget's __widget__ against the recording backend, along with their cmds call counts """
+    with backend.recording() as recorder:
+        results = {"create_panel": {}, "create_panel.calls": {}, "extract_reflection": {}, "widget": {}, "widget.calls": {}}
+        for size in sizes:
+            target = build_panel_class(size)()
+
+            def create():
+                cmds_root = inspector.create_panel(target, 75)
+                recorder.deleteUI(cmds_root)
+
+            results["extract_reflection"][size] = min(timeit.repeat(lambda: engine.Fragment.extract_reflection(target), number=number, repeat=3)) / number
+            results["create_panel"][size] = min(timeit.repeat(create, number=number, repeat=3)) / number
+            recorder.reset_calls()
+            create()
+            results["create_panel.calls"][size] = recorder.total_calls
+            print(f"{size} fields: create_panel {results['create_panel'][size] * 1e3:.2f}ms ({results['create_panel.calls'][size]} calls), extract_reflection {results['extract_reflection'][size] * 1e3:.3f}ms")
+
+        for name, (factory, default) in WIDGET_SPECS.items():
+            target = type(f"{name}Target", (object,), {"__annotations__": {"field": factory(0)}, "field": default})()
+            fragment = engine.Fragment.extract_reflection(target)["Group 0"][0]
+
+            def build():
+                layout = recorder.columnLayout()
+                fragment.build_widget()
+                recorder.deleteUI(layout)
+
+            results["widget"][name] = min(timeit.repeat(build, number=number * 100, repeat=3)) / (number * 100)
+            recorder.reset_calls()
+            fragment.build_widget()
+            results["widget.calls"][name] = recorder.total_calls
+            print(f"{name}.__widget__: {results['widget'][name] * 1e6:.1f}us ({results['widget.calls'][name]} calls)")
+    return results
+
+
+@dataclass
+class ObservedRecord:
+    """ Dataclass target, its instances are unhashable, observing them must neither fail nor break the class """
+    count: widgets.IntSlider("count", min=0, max=10) = 0
+
+
+def bench_observe(writes: int = 10000) -> dict[str, float]:
+    """ Time a burst of programmatic writes to an observed panel's fields and count the cmds calls made by the following idle flush """
+    with backend.recording() as recorder:
+        target = build_panel_class(len(WIDGET_SPECS))()
+        inspector.create_panel(target, 75, observe=True)
+        numbers = [name for name in engine.Schema.of(type(target)).fields if isinstance(getattr(target, name), (int, float)) and not isinstance(getattr(target, name), bool)]
+
+        recorder.reset_calls()
+        start = timeit.default_timer()
+        for index in range(writes):
+            setattr(target, numbers[index % len(numbers)], index % 10)
+        results = {"burst": timeit.default_timer() - start, "burst.calls": recorder.total_calls}
+        recorder.flush()
+        results["flush.calls"] = recorder.total_calls
+        print(f"{writes} observed writes: {results['burst'] * 1e3:.2f}ms, {results['burst.calls']} calls during the burst, {results['flush.calls']} calls after the idle flush")
+
+        record = ObservedRecord()
+        panel = inspector.create_panel(record, 75, observe=True)
+        record.count = 7
+        recorder.flush()
+        field_element, _ = panel.fragments[0].controls
+        assert recorder.controls[field_element]["value"] == 7 and ObservedRecord(3).count == 3, "Observing a dataclass target failed"
+        record.count = 8
+        recorder.deleteUI(panel)
+        recorder.flush()                        # <- The refresh queued before the panel was deleted must skip it
+    return results
+
+
+def bench_rebind(size: int = 100, number: int = 20) -> dict[str, float]:
+    """ Compare switching a panel's target by rebuilding it against rebinding it, timings and cmds calls """
+    with backend.recording() as recorder:
+        panel_class = build_panel_class(size)
+        targets = [panel_class() for _ in range(2)]
+        panel = inspector.create_panel(targets[0], 75)
+
+        def rebuild():
+            recorder.deleteUI(inspector.create_panel(targets[1], 75))
+
+        def rebind():
+            panel.rebind(targets[1])
+
+        results = {}
+        for name, function in (("rebuild", rebuild), ("rebind", rebind)):
+            results[name] = min(timeit.repeat(function, number=number, repeat=3)) / number
+            recorder.reset_calls()
+            function()
+            results[f"{name}.calls"] = recorder.total_calls
+
+        built = inspector.create_panel(ObservedRecord(4), 75)
+        assert recorder.controls[built.fragments[0].controls[0]]["value"] == 4, "A built panel must show the bound value, as a rebound one does"
+        recorder.deleteUI(built)
+        print(f"{size} fields, switching target: rebuild {results['rebuild'] * 1e3:.2f}ms ({results['rebuild.calls']} calls), rebind {results['rebind'] * 1e3:.2f}ms ({results['rebind.calls']} calls)")
+    return results
+
+
+def bench_profiler(size: int = 100, number: int = 20) -> dict[str, float]:
+    """ Time create_panel with the profiler disabled and enabled """
+    with backend.recording() as recorder:
+        target = build_panel_class(size)()
+        create = lambda: recorder.deleteUI(inspector.create_panel(target, 75))
+        results = {"disabled": min(timeit.repeat(create, number=number, repeat=3)) / number}
+        profiler.enable()
+        results["enabled"] = min(timeit.repeat(create, number=number, repeat=3)) / number
+        profiler.disable()
+        profiler.reset()
+        print(f"{size} fields create_panel: profiler disabled {results['disabled'] * 1e3:.2f}ms, enabled {results['enabled'] * 1e3:.2f}ms")
+    return results
+
+
+def bench_compiled(sizes=(100, 1000), number: int = 10) -> dict[str, dict]:
+    """ Compare create_panel's interpreted path against its compiled builders, with trivial widgets so the panel's own overhead dominates """
+    with backend.recording() as recorder:
+        results = {"interpreted": {}, "compiled": {}}
+        for size in sizes:
+            target = build_hierarchy(1, size)()
+            for mode in results:
+                create = lambda: recorder.deleteUI(inspector.create_panel(target, 75, compiled=mode == "compiled"))
+                results[mode][size] = min(timeit.repeat(create, number=number, repeat=5)) / number
+            print(f"{size} fields create_panel: interpreted {results['interpreted'][size] * 1e3:.2f}ms, compiled {results['compiled'][size] * 1e3:.2f}ms")
+    return results
+
+
+def bench_widget_specs(fields: int = 5000, distinct: int = 50) -> dict[str, float]:
+    """ Measure the time and memory taken to declare a synthetic class of annotated fields, where the widget specs repeat every distinct fields """
+    def declare():
+        members = {"__annotations__": {}}
+        for index in range(fields):
+            members["__annotations__"][f"field_{index}"] = widgets.IntSlider("value", f"Group {index % distinct % 5}", min=0, max=index % distinct)
+            members[f"field_{index}"] = 0
+        return type("Specs", (object,), members)
+
+    elapsed = min(timeit.repeat(declare, number=1, repeat=3))
+    tracemalloc.start()
+    specs_class = declare()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    metadata = {id(annotation.__metadata__[0]) for annotation in specs_class.__annotations__.values()}
+    results = {"time": elapsed, "memory": memory, "instances": len(metadata)}
+    choices = [("a", 1)]
+    listed, mapped = widgets.Dropdown("choice", choices=choices), widgets.Dropdown("choice", choices=dict(choices))
+    choices.append(("b", 2))
+    assert listed is not mapped and listed.__metadata__[0].choices == (("a", 1),), "Specs differing by their options' types, or edited by their caller, were shared"
+    assert widgets.IntSlider("value", min=0) is not widgets.IntSlider("value", min=0.0), "Specs differing by their options' types were shared"
+    print(f"{fields} fields declared: {elapsed * 1e3:.2f}ms, {memory / 1024:.0f}KiB retained, {len(metadata)} widget instances")
+    return results
+
+
+def bench_search(sizes=(100, 1000), query: str = "float 12") -> dict[str, dict]:
+    """ Type a query one key at a time, then erase it, in a searchable panel filtering its rows in place, against rebuilding the panel
+        from a copy of the class holding only the matching fields on every keystroke, also times a fuzzy search """
+    with backend.recording() as recorder:
+        keystrokes = [query[:length] for length in range(1, len(query) + 1)] + [query[:length] for length in range(len(query) - 1, -1, -1)]
+        results = {"rebuild": {}, "rebuild.calls": {}, "search": {}, "search.edits": {}, "fuzzy": {}}
+        for size in sizes:
+            target_class = build_panel_class(size)
+            index = inspector.field_index(engine.Schema.of(target_class))
+            fields = engine.Schema.of(target_class).fields
+
+            recorder.reset_calls()
+            start = time.perf_counter()
+            panel = inspector.create_panel(target_class(), 75)
+            for text in keystrokes:             # <- The workaround, a panel over a filtered copy of the class
+                matches = index.match(text)
+                names = [name for position, name in enumerate(fields) if matches is None or position in matches]
+                filtered = type(target_class.__name__, (object,), {"__annotations__": {name: target_class.__annotations__[name] for name in names},
+                                                                   **{name: getattr(target_class, name) for name in names}})
+                recorder.deleteUI(panel)
+                panel = inspector.create_panel(filtered(), 75)
+            results["rebuild"][size] = (time.perf_counter() - start) / len(keystrokes)
+            results["rebuild.calls"][size] = recorder.total_calls // len(keystrokes)
+            recorder.deleteUI(panel)
+
+            panel = inspector.create_panel(target_class(), 75, searchable=True)
+            recorder.reset_calls()
+            start = time.perf_counter()
+            for text in keystrokes:
+                recorder.fire(panel.search_element, "textChangedCommand", text)
+            results["search"][size] = (time.perf_counter() - start) / len(keystrokes)
+            results["search.edits"][size] = recorder.total_calls / len(keystrokes)
+
+            start = time.perf_counter()
+            for length in range(1, len(query) + 1):
+                panel.search(f"~{query[:length]}")
+            results["fuzzy"][size] = (time.perf_counter() - start) / len(query)
+            panel.search("")
+            recorder.deleteUI(panel)
+            print(f"{size} fields, typing and erasing {query!r}: rebuild {results['rebuild'][size] * 1e3:.2f}ms ({results['rebuild.calls'][size]} calls) per key, "
+                  f"in place {results['search'][size] * 1e3:.3f}ms ({results['search.edits'][size]:.1f} visibility edits) per key, fuzzy {results['fuzzy'][size] * 1e3:.3f}ms per key")
+    return results
+
+
+def bench_string_box(sizes=(1000, 20000), page_size: int = 200, number: int = 5) -> dict[str, dict]:
+    """ Compare building a full string box against a paged one on a large node set, and time searching and turning pages in the paged one,
+        along with the number of list entries materialized """
+    with backend.recording() as recorder:
+        results = {"full": {}, "paged": {}, "full.items": {}, "paged.items": {}, "prefix": {}, "substring": {}, "substring.first": {}, "turn": {}}
+        for size in sizes:
+            nodes = {f"{('pCube', 'pSphere', 'joint', 'locator')[i % 4]}{i}" for i in range(size)}
+            for name, spec in (("full", widgets.StringBox("nodes")), ("paged", widgets.StringBox("nodes", page_size=page_size))):
+                target = type("Nodes", (object,), {"__annotations__": {"nodes": spec}, "nodes": nodes})()
+                fragment = engine.Fragment.extract_reflection(target)[""][0]
+
+                def build():
+                    layout = recorder.columnLayout()
+                    fragment.build_widget()
+                    recorder.deleteUI(layout)
+
+                results[name][size] = min(timeit.repeat(build, number=number, repeat=3)) / number
+                layout = recorder.columnLayout()
+                fragment.build_widget()
+                results[f"{name}.items"][size] = len(recorder.controls[fragment.controls[0]]["allItems"])
+                if name == "full":
+                    recorder.deleteUI(layout)
+
+            _, pager, render = fragment.controls        # <- The paged string box, still alive
+            start = time.perf_counter()
+            pager.search("locator1*")
+            render()
+            results["prefix"][size] = time.perf_counter() - start
+            start = time.perf_counter()
+            pager.search("ere1")
+            render()
+            results["substring.first"][size] = time.perf_counter() - start     # <- Includes building the suffix array
+            start = time.perf_counter()
+            pager.search("be2")
+            render()
+            results["substring"][size] = time.perf_counter() - start
+            pager.search("")
+            start = time.perf_counter()
+            pager.turn(size // page_size // 2)
+            render()
+            results["turn"][size] = time.perf_counter() - start
+            recorder.deleteUI(layout)
+            print(f"{size} nodes: full list {results['full'][size] * 1e3:.2f}ms ({results['full.items'][size]} items), paged {results['paged'][size] * 1e3:.2f}ms ({results['paged.items'][size]} items), "
+                  f"prefix search {results['prefix'][size] * 1e3:.3f}ms, substring search {results['substring'][size] * 1e3:.3f}ms "
+                  f"(first {results['substring.first'][size] * 1e3:.1f}ms), page turn {results['turn'][size] * 1e3:.3f}ms")
+    return results
+
+
+class RigControl:
+    """ Inspected class describing the attributes of a rig control node """
+    weight: widgets.FloatSlider("weight", min=0, max=1) = 0.5
+    visibility: widgets.Toggle("visibility") = True
+    offset: widgets.MVecField("offset") = backend.MVector(0, 0, 0)
+
+
+class SetAttrNode:
+    """ Hand written wrapper over a single node, the way node attributes were edited before node targets, every read and write is a cmds call """
+
+    def __init__(self, node: str) -> None:
+        object.__setattr__(self, "node", node)
+
+    def __getattr__(self, name):
+        value = backend.cmds.getAttr(f"{self.node}.{name}")
+        return backend.MVector(*value) if isinstance(value, list) else value
+
+    def __setattr__(self, name, value) -> None:
+        backend.cmds.setAttr(f"{self.node}.{name}", *(value if isinstance(value, list) else (value,)))
+
+
+def bench_plugs(nodes: int = 100, edits: int = 50) -> dict[str, float]:
+    """ Replay an edit burst over many selected nodes, a slider drag, the three offset fields and the visibility toggle, then one idle cycle,
+        against wrappers calling setAttr per edit and per node, and against a node target queueing plug writes into one MDGModifier """
+    if not hasattr(plugs.om, "create_node"):
+        print("maya.api.OpenMaya is loaded, the plug benchmark only runs against the headless stand-in")
+        return {}
+    with backend.recording() as recorder:
+        names = [f"control{index}" for index in range(nodes)]
+        for name in names:
+            plugs.om.create_node(name, weight=0.5, visibility=True, offset=(0, 0, 0))
+            recorder.attributes.update({f"{name}.weight": 0.5, f"{name}.visibility": True, f"{name}.offset": [0.0, 0.0, 0.0]})
+        schema = engine.Schema.of(RigControl)
+        results = {}
+        try:
+            for name, target in (("setAttr", engine.MultiTarget(map(SetAttrNode, names))), ("plugs", plugs.NodeTarget(RigControl, names))):
+                fragments = {fragment.bind.field_name: fragment for fragments in schema.bind(target).values() for fragment in fragments}
+                layout = recorder.columnLayout()
+                for fragment in fragments.values():
+                    fragment.build_widget()
+                recorder.reset_calls()
+                calls, written = plugs.om.MDGModifier.calls, plugs.om.MDGModifier.plugs_written
+                start = time.perf_counter()
+                for value in range(1, edits + 1):
+                    recorder.fire(fragments["weight"].controls[1], "dc", value / edits)
+                for index, field_element in enumerate(fragments["offset"].controls):
+                    recorder.fire(field_element, "cc", index + 1.0)
+                recorder.fire(fragments["visibility"].controls[0], "cc", False)
+                recorder.flush()                    # <- The idle cycle following the burst
+                results[name] = time.perf_counter() - start
+                results[f"{name}.calls"] = recorder.calls["setAttr"] + plugs.om.MDGModifier.calls - calls
+                results[f"{name}.plugs"] = recorder.calls["setAttr"] + plugs.om.MDGModifier.plugs_written - written
+                recorder.deleteUI(layout)
+            last = plugs.om.scene[names[-1]].values
+            assert last["weight"] == 1.0 and last["offset"] == [1.0, 2.0, 3.0] and last["visibility"] is False, last
+            print(f"{nodes} nodes, {edits} drag edits then 4 field edits: setAttr {results['setAttr'] * 1e3:.1f}ms ({results['setAttr.calls']} calls), "
+                  f"plugs {results['plugs'] * 1e3:.1f}ms ({results['plugs.calls']} modifier calls, {results['plugs.plugs']} plug values)")
+        finally:
+            for name in names:
+                plugs.om.scene.pop(name, None)
+    return results
+
+
+class SlowSetter:
+    """ Target whose setter takes a while, standing for a bake or file io """
+    cost = 0.01
+
+    def __init__(self):
+        self._value = 0
+        self.writes = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        time.sleep(SlowSetter.cost)
+        self.writes += 1
+        self._value = value
+
+
+class SceneCache:
+    """ Target standing for a large scene cache, inspected by the leak test """
+    __annotations__ = {"name": widgets.TextField("name", "Cache"), "frames": widgets.IntSlider("frames", "Cache", min=0, max=100),
+                       "enabled": widgets.Toggle("enabled", "Cache"), "files": widgets.ToggleShelf("files", "Cache")}
+    name = "cache"
+    frames = 1
+    enabled = True
+    files = {}
+
+    def __init__(self, size: int):
+        self.payload = bytearray(size)
+        self.files = {"a.tga": True, "b.tga": False}
+
+
+def bench_presets(count: int = 10000) -> dict[str, float]:
+    """ Measure the snapshot throughput, the results are seconds per instance and printed as instances per second, against walking the fields into a dictionary and pickling it, on a class covering
+        every widget type, capture streams through dump, restore streams through load, and apply writes one preset to every instance """
+    members = {"__annotations__": {}}
+    for name, (factory, default) in WIDGET_SPECS.items():
+        members["__annotations__"][name.lower()] = factory(0)
+        members[name.lower()] = default
+    target_class = type("Preset", (object,), members)
+    targets = [target_class() for _ in range(count)]
+    for index, target in enumerate(targets):
+        target.stringbox = {f"node{index}", "pCube1"}
+        target.toggleshelf = {f"file{index}.tga": True}
+        target.intslider = index % 10
+    fields = engine.Schema.of(target_class).fields
+    results = {}
+
+    def timed(name, function):
+        start = time.perf_counter()
+        function()
+        results[name] = (time.perf_counter() - start) / count     # <- Lower is better, as compare expects
+
+    blob = io.BytesIO()
+    timed("pickle.capture", lambda: pickle.dump([{field: getattr(target, field) for field in fields} for target in targets], blob))
+
+    def pickle_restore():
+        blob.seek(0)
+        for target, values in zip(targets, pickle.load(blob)):
+            for field, value in values.items():
+                setattr(target, field, value)
+
+    timed("pickle.restore", pickle_restore)
+
+    stream = io.StringIO()
+    timed("capture", lambda: presets.dump(targets, stream))
+    results["bytes"] = len(stream.getvalue().encode())
+    stream.seek(0)
+    timed("restore", lambda: presets.restore_all(targets, stream))
+    preset = presets.capture(targets[0])
+    timed("apply", lambda: presets.apply(preset, targets))
+    print(f"{count} instances, {len(fields)} fields: pickle capture {1 / results['pickle.capture']:.0f}/s, restore {1 / results['pickle.restore']:.0f}/s, "
+          f"snapshot capture {1 / results['capture']:.0f}/s, restore {1 / results['restore']:.0f}/s, apply one preset {1 / results['apply']:.0f}/s, "
+          f"{results['bytes'] / count:.0f} bytes per instance")
+    return results
+
+
+def bench_leaks(count: int = 1000, payload: int = 16384, samples: int = 5) -> dict[str, dict]:
+    """ Open and close count windows each holding a panel over a fresh scene cache, measuring the memory still allocated along the way,
+        then run it again with the panels' teardown script jobs killed, which is how panels behaved before they released what they hold """
+    with backend.recording() as recorder:
+        results = {"released": {}, "kept": {}}
+        for name in ("released", "kept"):
+            alive = weakref.WeakSet()
+            opened = set(inspector.panels)
+            gc.collect()
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            for index in range(1, count + 1):
+                window = recorder.window()
+                cache = SceneCache(payload)
+                alive.add(cache)
+                inspector.create_panel(cache, 75)
+                del cache
+                if name == "kept":
+                    recorder.jobs.clear()
+                recorder.deleteUI(window)
+                if index % (count // samples) == 0:
+                    gc.collect()
+                    results[name][index] = tracemalloc.get_traced_memory()[0] - base
+            tracemalloc.stop()
+            results[name]["alive"] = len(alive)
+            results[name]["panels"] = len(set(inspector.panels) - opened)
+            for panel in set(inspector.panels) - opened:
+                panel.release()
+            print(f"{count} panels opened and closed, teardown {'on' if name == 'released' else 'off'}: "
+                  f"{', '.join(f'{results[name][index] / 1024:.0f}KiB' for index in range(count // samples, count + 1, count // samples))} retained, "
+                  f"{results[name]['alive']} caches alive, {results[name]['panels']} panels registered")
+    return results
+
+
+def bench_async(edits: int = 50, cost: float = 0.01) -> dict[str, float]:
+    """ Replay a slider drag over a field whose setter takes cost seconds, the main thread time spent in the drag callbacks is what blocks maya,
+        a synchronous field blocks on every write, an asynchronous one only queues them and supersedes the values its worker didn't reach """
+    with backend.recording() as recorder:
+        SlowSetter.cost = cost
+        results = {}
+        for name, asynchronous in (("sync", False), ("async", True)):
+            target_class = type("Slow", (SlowSetter,), {"__annotations__": {"value": widgets.IntSlider("value", min=0, max=edits, asynchronous=asynchronous)}})
+            target = target_class()
+            fragment = engine.Fragment.extract_reflection(target)[""][0]
+            layout = recorder.columnLayout()
+            fragment.build_widget()
+            _, slider_element = fragment.controls
+            start = time.perf_counter()
+            for value in range(1, edits + 1):
+                recorder.fire(slider_element, "dc", value)
+            results[name] = time.perf_counter() - start
+            if asynchronous:
+                while target.value != edits:
+                    time.sleep(cost)
+                recorder.flush()
+            results[f"{name}.settled"] = time.perf_counter() - start
+            results[f"{name}.writes"] = target.writes
+            recorder.deleteUI(layout)
+        print(f"{edits} drag edits, {cost * 1e3:.0f}ms setter: sync blocks {results['sync'] * 1e3:.1f}ms ({results['sync.writes']} writes), "
+              f"async blocks {results['async'] * 1e3:.2f}ms ({results['async.writes']} writes, settled in {results['async.settled'] * 1e3:.1f}ms)")
+    return results
+
+
+def bench_auto_inspector(events: int = 200, nodes: int = 20, fields: int = 40, delay: float = 0.02) -> dict[str, float]:
+    """ Replay a selection burst, such as a marquee drag, against a naive inspector rebuilding on every selection event and against the auto inspector,
+        the events come 1ms apart, then the selection goes back and forth between two nodes standing for objects of the same class """
+    with backend.recording() as recorder:
+        target_class = build_panel_class(fields)
+        wrappers = {f"|node{i}": target_class() for i in range(nodes)}
+        results = {}
+        recorder.reset_calls()
+        start = time.perf_counter()
+        for index in range(events):             # <- Naive, every event rebuilds the panel
+            recorder.responses["ls"] = [f"|node{index % nodes}"]
+            recorder.deleteUI(inspector.create_panel(wrappers[recorder.responses["ls"][0]], 75))
+        results["naive"] = time.perf_counter() - start
+        results["naive.calls"] = recorder.total_calls
+
+        recorder.responses["ls"] = []
+        auto = inspector.AutoInspector(lambda selection: wrappers.get(selection[0]), delay=delay)
+        auto.open()
+        recorder.reset_calls()
+        spent = 0.0
+        for index in range(events):
+            recorder.responses["ls"] = [f"|node{index % nodes}"]
+            start = time.perf_counter()
+            recorder.fire_event("SelectionChanged")
+            recorder.flush()                    # <- Maya goes idle between two events
+            spent += time.perf_counter() - start
+            time.sleep(0.001)
+        for selection in ([f"|node{nodes - 1}"], ["|node0"], ["|node0"], ["|node1"]):
+            recorder.responses["ls"] = selection
+            recorder.fire_event("SelectionChanged")
+            time.sleep(delay * 2)
+            start = time.perf_counter()
+            recorder.flush()
+            spent += time.perf_counter() - start
+        results["auto"] = spent
+        results["auto.calls"] = recorder.total_calls
+        results.update(auto.metrics())
+        auto.close()
+        print(f"{events} selection events, {fields} fields: naive {results['naive'] * 1e3:.1f}ms ({results['naive.calls']} calls, {events} rebuilds), "
+              f"auto {results['auto'] * 1e3:.1f}ms ({results['auto.calls']} calls, {results['events']} events, {results['updates']} updates, {results['skipped']} skipped, "
+              f"{results['built']} built, {results['rebound']} rebound)")
+    return results
+
+
+def bench_dropdown(sizes=(10, 1000, 10000), number: int = 20) -> dict[str, dict]:
+    """ Compare building a dropdown listing static choices against one listing a provider's choices, and time opening the provided one,
+        the provider is only run on the first opening, later openings use its memoized choices """
+    with backend.recording() as recorder:
+        results = {"static": {}, "provided": {}, "provider_calls": {}, "first_open": {}, "open": {}}
+        for size in sizes:
+            names = [f"shadingGroup{i}" for i in range(size)]
+            provider = lambda: list(names)      # <- A fresh provider per size, so the memo starts empty
+            for name, spec in (("static", widgets.Dropdown("choice", choices=names)), ("provided", widgets.Dropdown("choice", choices=provider))):
+                target = type("Choice", (object,), {"__annotations__": {"choice": spec}, "choice": names[0]})()
+                fragment = engine.Fragment.extract_reflection(target)[""][0]
+
+                def build():
+                    layout = recorder.columnLayout()
+                    fragment.build_widget()
+                    recorder.deleteUI(layout)
+
+                results[name][size] = min(timeit.repeat(build, number=number, repeat=3)) / number
+
+            calls = providers.memo.stats["calls"]
+            layout = recorder.columnLayout()
+            fragment.build_widget()
+            results["provider_calls"][size] = providers.memo.stats["calls"] - calls
+            menu_element = fragment.controls[0]
+            start = time.perf_counter()
+            recorder.fire(menu_element, "postMenuCommand")
+            results["first_open"][size] = time.perf_counter() - start
+            results["open"][size] = min(timeit.repeat(lambda: recorder.fire(menu_element, "postMenuCommand"), number=number, repeat=3)) / number
+            recorder.deleteUI(layout)
+            providers.memo.invalidate(provider)
+            print(f"{size} choices: static build {results['static'][size] * 1e3:.3f}ms, provided build {results['provided'][size] * 1e3:.3f}ms "
+                  f"({results['provider_calls'][size]} provider calls), first open {results['first_open'][size] * 1e3:.2f}ms, memoized open {results['open'][size] * 1e6:.1f}us")
+    return results
+
+
+def bench_arrays(sizes=(10000, 1000000), number: int = 3) -> dict[str, dict]:
+    """ Compare the buffer view's bulk operations against a per item loop writing through the buffer, on float arrays """
+    results = {"loop.scale": {}, "scale": {}, "loop.clamp": {}, "clamp": {}, "set_range": {}, "normalize": {}, "window": {}}
+    for size in sizes:
+        buffer = array("d", range(size))
+        view = arrays.BufferView(buffer, 10)
+
+        def loop_scale():
+            for index in range(size):
+                buffer[index] = buffer[index] * 1.0
+
+        def loop_clamp():
+            for index in range(size):
+                buffer[index] = min(max(buffer[index], 0.0), float(size))
+
+        operations = {"loop.scale": loop_scale, "scale": lambda: view.scale(1.0), "loop.clamp": loop_clamp, "clamp": lambda: view.clamp(0.0, float(size)),
+                      "set_range": lambda: view.set_range(1.0, 0, size // 2), "normalize": lambda: view.normalize(), "window": lambda: view.window()}
+        for name, operation in operations.items():
+            results[name][size] = min(timeit.repeat(operation, number=number, repeat=3)) / number
+        print(f"{size} doubles{' with numpy' if arrays.numpy else ''}: scale loop {results['loop.scale'][size] * 1e3:.2f}ms, bulk {results['scale'][size] * 1e3:.2f}ms, "
+              f"clamp loop {results['loop.clamp'][size] * 1e3:.2f}ms, bulk {results['clamp'][size] * 1e3:.2f}ms, set range {results['set_range'][size] * 1e3:.2f}ms, "
+              f"normalize {results['normalize'][size] * 1e3:.2f}ms, page window {results['window'][size] * 1e6:.2f}us")
+    return results
+
+
+def bench_thumbnails(sizes=(10, 100, 1000), decode: float = 0.005) -> dict[str, dict]:
+    """ Time opening a previewing toggle shelf against the recording backend, the thumbnails take decode seconds each to make,
+        the shelf opening must not wait for them, a second opening is answered from the disk cache """
+    def render(source, destination, size):      # <- Synthetic decode cost, the benchmark has no image library to rely on
+        time.sleep(decode)
+        shutil.copyfile(source, destination)
+
+    assert thumbnails.cache is None, "Importing thumbnails created the shared cache, it must wait for the first request"
+    with backend.recording() as recorder:
+        results = {"open": {}, "ready": {}, "attached": {}, "warm_open": {}, "warm_ready": {}, "hits": {}}
+        with tempfile.TemporaryDirectory() as folder:
+            for size in sizes:
+                files = []
+                for index in range(size):
+                    files.append(os.path.join(folder, f"texture_{size}_{index}.tga"))
+                    with open(files[-1], "wb") as file:
+                        file.write(index.to_bytes(4, "little") * 256)
+
+                cache = thumbnails.ThumbnailCache(os.path.join(folder, f"cache_{size}"), renderer=render)
+                previous_cache, thumbnails.cache = thumbnails.cache, cache
+                target = type("Shelf", (object,), {"__annotations__": {"files": widgets.ToggleShelf("files", preview=True)}, "files": dict.fromkeys(files, False)})()
+                try:
+                    for prefix in ("", "warm_"):
+                        fragment = engine.Fragment.extract_reflection(target)[""][0]
+                        layout = recorder.columnLayout()
+                        start = time.perf_counter()
+                        fragment.build_widget()
+                        results[f"{prefix}open"][size] = time.perf_counter() - start
+                        cache.wait()
+                        results[f"{prefix}ready"][size] = time.perf_counter() - start
+                        recorder.flush()
+                        results["attached"][size] = sum(1 for flags in recorder.controls.values() if "image" in flags)
+                        recorder.deleteUI(layout)
+                    results["hits"][size] = cache.stats["hits"]
+                finally:
+                    thumbnails.cache = previous_cache
+                print(f"{size} files, {decode * 1e3:.0f}ms per thumbnail: shelf open {results['open'][size] * 1e3:.2f}ms, thumbnails ready {results['ready'][size] * 1e3:.1f}ms, "
+                      f"{results['attached'][size]} attached, reopen {results['warm_open'][size] * 1e3:.2f}ms with {results['hits'][size]} cache hits ready in {results['warm_ready'][size] * 1e3:.1f}ms")
+    return results
+
+
+def bench_finder(misses: int = 10000) -> dict[str, float]:
+    """ Report the plugin's module finder statistics since maya started, then time a burst of failed imports, it only runs inside maya with the plugin loaded """
+    finder = next((f for f in sys.meta_path if type(f).__name__ == "MetaWindowModuleFinder"), None)
+    if finder is None:
+        print("MetaWindowModuleFinder is not installed, load the MetaWindow plugin in maya to benchmark it")
+        return {}
+
+    results = {f"startup.{key}": value for key, value in finder.stats.items()}
+    print(f"finder since startup: {finder.stats['calls']} calls, {finder.stats['hits']} hits, {finder.stats['refreshes']} refreshes, {finder.stats['time'] * 1e3:.2f}ms")
+
+    calls, spent = finder.stats["calls"], finder.stats["time"]
+    for index in range(misses):
+        importlib.util.find_spec(f"metawindow_missing_module_{index}")
+    results["miss.calls"] = finder.stats["calls"] - calls
+    results["miss"] = (finder.stats["time"] - spent) / misses
+    print(f"finder misses: {results['miss.calls']} calls, {results['miss'] * 1e6:.2f}us per miss")
+    return results
+
+
+def run_suite(quick: bool = False) -> dict[str, dict]:
+    """ Run every benchmark, returns their results by benchmark name """
+    return {
+        "reflection": bench_reflection(depth=4 if quick else 20, fields_per_class=25 if quick else 50),
+        "batch_set": bench_batch_set(count=200),
+        "list_updates": bench_list_updates(),
+        "panel": bench_panel(sizes=(10, 100) if quick else (10, 100, 1000)),
+        "observe": bench_observe(),
+        "rebind": bench_rebind(),
+        "profiler": bench_profiler(),
+        "compiled": bench_compiled(),
+        "widget_specs": bench_widget_specs(),
+        "search": bench_search(sizes=(100, 1000) if quick else (100, 1000, 5000)),
+        "string_box": bench_string_box(sizes=(1000,) if quick else (1000, 20000)),
+        "presets": bench_presets(count=2000 if quick else 10000),
+        "leaks": bench_leaks(count=200 if quick else 1000),
+        "async": bench_async(),
+        "plugs": bench_plugs(nodes=20 if quick else 100),
+        "auto_inspector": bench_auto_inspector(events=100 if quick else 200),
+        "dropdown": bench_dropdown(sizes=(10, 1000) if quick else (10, 1000, 10000)),
+        "arrays": bench_arrays(sizes=(10000,) if quick else (10000, 1000000)),
+        "thumbnails": bench_thumbnails(sizes=(10, 100) if quick else (10, 100, 1000)),
+        "finder": bench_finder(),
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """ Flatten nested results into a {"benchmark.measure.size": value} dictionary """
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list[str]:
+    """ List the measures that got worse than the baseline by more than the tolerance, timings and call counts alike """
+    current, previous = flatten(results), flatten(baseline)
+    return [f"{key}: {previous[key]:.6g} -> {value:.6g}" for key, value in current.items()
+            if key in previous and previous[key] and value > previous[key] * (1 + tolerance)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the MetaWindow benchmark suite")
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--compare", help="report regressions against this json file")
+    parser.add_argument("--quick", action="store_true", help="run the smaller sizes only")
+    arguments = parser.parse_args()
+
+    suite_results = run_suite(arguments.quick)
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            regressions = compare(suite_results, json.load(baseline_file))
+        print("\n".join(["Regressions:"] + regressions) if regressions else "No regressions")
+    if arguments.save:
+        with open(arguments.save, "w") as results_file:
+            json.dump(suite_results, results_file, indent=2)
+    if arguments.compare and regressions:
+        sys.exit(1)
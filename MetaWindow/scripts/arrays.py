@@ -0,0 +1,128 @@
+from array import array
+from itertools import repeat
+from operator import mul
+
+try:                    # <- With numpy the bulk operations run as in place ufuncs, without it they run as one map over the range
+    import numpy
+except ImportError:
+    numpy = None
+
+
+FORMATS = "bBhHiIlLqQfd"
+""" Item formats of the supported buffers, the ones array.array shares with the buffer protocol """
+
+INTEGER_FORMATS = "bBhHiIlLqQ"
+""" Supported item formats holding integers """
+
+
+def flat_view(buffer) -> memoryview:
+    """ Flat, writable view over a buffer protocol object, such as an array.array or a C contiguous numpy array, nothing is copied """
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError(f"{type(buffer).__name__} buffer is read only")
+    if view.format not in FORMATS:
+        raise TypeError(f"Unsupported item format {view.format!r}, expected one of {FORMATS}")
+    if view.ndim != 1:
+        if not view.c_contiguous:
+            raise TypeError("Only C contiguous buffers can be viewed flat")
+        view = view.cast("B").cast(view.format)
+    return view
+
+
+class BufferView:
+    """ This class is a flat view over a numeric buffer, with a page sized window into it and bulk operations over a range of it,
+        every operation writes into the buffer itself, in one pass over the range, the buffer is only viewed for the length of an operation,
+        a lasting view would lock it, an array.array could no longer be appended to """
+
+    def __init__(self, buffer, page_size: int) -> None:
+        self.buffer = buffer
+        """ The viewed object """
+
+        self.format: str = self._format(buffer)
+        """ Item format of the buffer """
+
+        self.page_size = page_size
+        """ Number of items in a page """
+
+        self.page: int = 0
+        """ Current page number, starting at 0 """
+
+    @staticmethod
+    def _format(buffer) -> str:
+        """ Check the buffer can be viewed flat, returns its item format """
+        with flat_view(buffer) as values:
+            return values.format
+
+    def __len__(self) -> int:
+        with flat_view(self.buffer) as values:
+            return len(values)
+
+    def __setitem__(self, index: int, value) -> None:
+        with flat_view(self.buffer) as values:
+            values[index] = value
+
+    @property
+    def is_integer(self) -> bool:
+        return self.format in INTEGER_FORMATS
+
+    def rebind(self, buffer) -> None:
+        """ View another buffer, staying on the same page if it still exists """
+        self.format = self._format(buffer)
+        self.buffer = buffer
+
+    def turn(self, pages: int) -> None:
+        """ Move by a number of pages, backwards if negative, the window stays within the buffer """
+        self.page = max(0, min(self.page + pages, (len(self) - 1) // self.page_size))
+
+    def window(self) -> tuple[int, list]:
+        """ Index of the first item of the current page, and a copy of the page's items """
+        with flat_view(self.buffer) as values:
+            self.page = max(0, min(self.page, (len(values) - 1) // self.page_size))     # <- The buffer may have shrunk since the last turn
+            first = self.page * self.page_size
+            return first, values[first:first + self.page_size].tolist()
+
+    def _range(self, start: int, stop: int | None):
+        """ A view over a range of items, along with its numpy equivalent if numpy is available, they only live as long as the calling operation """
+        values = flat_view(self.buffer)[start:stop]
+        return values, numpy.asarray(values) if numpy is not None else None
+
+    def _write(self, values: memoryview, items) -> None:
+        values[:] = array(values.format, items)
+
+    def set_range(self, value, start: int = 0, stop: int | None = None) -> None:
+        """ Set every item in the range to value """
+        values, vector = self._range(start, stop)
+        value = int(value) if self.is_integer else float(value)
+        if vector is not None:
+            vector[:] = value
+        else:
+            values[:] = array(values.format, [value]) * len(values)
+
+    def scale(self, factor: float, start: int = 0, stop: int | None = None) -> None:
+        """ Multiply every item in the range by factor, integers are truncated """
+        values, vector = self._range(start, stop)
+        if vector is not None:
+            numpy.multiply(vector, factor, out=vector, casting="unsafe")
+        elif self.is_integer:
+            self._write(values, map(int, map(mul, values, repeat(factor))))
+        else:
+            self._write(values, map(mul, values, repeat(factor)))
+
+    def normalize(self, start: int = 0, stop: int | None = None) -> None:
+        """ Scale the items in the range so they sum up to 1, as skin weights do, a range summing up to 0 is left untouched """
+        if self.is_integer:
+            raise TypeError("Integer buffers can't be normalized")
+        values, vector = self._range(start, stop)
+        total = float(vector.sum()) if vector is not None else sum(values)
+        if total:
+            self.scale(1.0 / total, start, stop)
+
+    def clamp(self, low, high, start: int = 0, stop: int | None = None) -> None:
+        """ Bring every item in the range within low and high """
+        values, vector = self._range(start, stop)
+        if self.is_integer:
+            low, high = int(low), int(high)
+        if vector is not None:
+            numpy.clip(vector, low, high, out=vector)
+        else:
+            self._write(values, map(min, map(max, values, repeat(low)), repeat(high)))
@@ -0,0 +1,272 @@
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from itertools import count
+import lifecycle
+import profiler
+
+try:
+    from maya import cmds as maya_cmds, utils as maya_utils
+    from maya.api.OpenMaya import MVector
+except ImportError:     # <- Running outside maya, only the recording backend is available
+    maya_cmds = maya_utils = None
+
+    class MVector(list):
+        """ Headless stand-in for OpenMaya's MVector, a list of 3 floats """
+        def __init__(self, x=0.0, y=0.0, z=0.0):
+            super().__init__(map(float, x) if isinstance(x, (list, tuple)) else (float(x), float(y), float(z)))
+
+
+class RecordingCmds:
+    """ This class is a headless stand-in for maya.cmds, it implements the commands used by the widgets and the inspector,
+        it records every call, keeps a tree of controls along with their flags, and can fire the callbacks stored in them """
+
+    ROOT = ""
+    """ Name of the implicit top level parent """
+
+    CONTAINERS = ("window", "workspaceControl")
+    """ Commands that become the current parent once created, on top of every *Layout command """
+
+    MENUS = ("optionMenu", "popupMenu")
+    """ Commands that become the parent of the next menuItems """
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        """ Number of calls made to each command """
+
+        self.controls: dict[str, dict] = {}
+        """ Flags of every living control, by control name """
+
+        self.children: dict[str, list[str]] = {RecordingCmds.ROOT: []}
+        """ Children of every living layout, by layout name """
+
+        self.parents: dict[str, str] = {}
+        """ Parent of every living control, by control name """
+
+        self.responses: dict[str, object] = {"ls": [], "fileDialog2": None}
+        """ Canned values returned by the commands that query maya itself, such as ls or fileDialog2, by command name """
+
+        self.deferred: list = []
+        """ Functions queued through defer, waiting for flush """
+
+        self.jobs: dict[int, dict] = {}
+        """ Flags of every living script job, by job number """
+
+        self.warnings: list[str] = []
+        """ Messages given to the warning command """
+
+        self.attributes: dict[str, object] = {}
+        """ Node attribute values written by setAttr, by plug name """
+
+        self.current_parent: str = RecordingCmds.ROOT
+        """ Parent of the next control created """
+
+        self.current_menu: str = RecordingCmds.ROOT
+        """ Parent of the next menu item created """
+
+        self._names = count(1)
+
+    def __getattr__(self, command: str):
+        if command.startswith("_"):
+            raise AttributeError(command)
+        function = self.__dict__[command] = partial(self._call, command)     # <- Cache it, so the next lookups skip __getattr__
+        return function
+
+    @property
+    def total_calls(self) -> int:
+        """ Number of calls made to any command """
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        """ Clear the call counters """
+        self.calls.clear()
+
+    def defer(self, function, *args) -> None:
+        """ Queue a function, the same way maya.utils.executeDeferred does """
+        self.deferred.append((function, args))
+
+    def flush(self) -> int:
+        """ Run the queued functions, including the ones they queue, returns how many ran, it stands in for maya becoming idle """
+        ran = 0
+        while self.deferred:
+            function, args = self.deferred.pop(0)
+            function(*args)
+            ran += 1
+        return ran
+
+    def fire(self, control: str, flag: str, *args):
+        """ Invoke the callback stored in the control's flag, as maya would on user interaction """
+        return self.controls[control][flag](*args)
+
+    def fire_event(self, event: str) -> int:
+        """ Run the script jobs waiting for the event, as maya would when it happens, returns how many ran """
+        jobs = [flags for flags in self.jobs.values() if (flags.get("event") or flags.get("e") or (None,))[0] == event]
+        for flags in jobs:
+            (flags.get("event") or flags.get("e"))[1]()
+        return len(jobs)
+
+    def _call(self, command: str, /, *args, **flags):
+        self.calls[command] += 1
+        edit = flags.pop("edit", False) or flags.pop("e", False)
+        query = flags.pop("query", False) or flags.pop("q", False)
+
+        handler = getattr(type(self), f"_{command}", None)
+        if handler:
+            return handler(self, *args, edit=edit, query=query, **flags)
+        if command in self.responses:
+            return self.responses[command]
+        if flags.get("exists") or flags.get("ex"):     # <- Maya accepts exists with or without the query flag
+            return bool(args) and args[0] in self.controls
+        if query:
+            return self._query(args[0], flags)
+        if edit:
+            return self._edit(args[0], flags)
+        return self._create(command, args[0] if args else None, flags)
+
+    def _create(self, command: str, name, flags: dict) -> str:
+        name = name or f"{command}{next(self._names)}"
+        parent = flags.get("parent", flags.get("p", self.current_menu if command == "menuItem" else self.current_parent))
+        self.controls[name] = flags
+        self.parents[name] = parent
+        self.children.setdefault(parent, []).append(name)
+        if command.endswith("Layout") or command in RecordingCmds.CONTAINERS:
+            self.children[name] = []
+            self.current_parent = name
+        elif command in RecordingCmds.MENUS:
+            self.children[name] = []
+            self.current_menu = name
+        return name
+
+    def _edit(self, control: str, flags: dict) -> str:
+        self.controls[control].update(flags)
+        return control
+
+    def _query(self, control: str, flags: dict):
+        if flags.get("childArray") or flags.get("ca") or flags.get("itemListLong") or flags.get("ill"):
+            return list(self.children.get(control, [])) or None
+        if flags.get("parent") or flags.get("p"):
+            return self.parents.get(control)
+        return self.controls[control].get(next(iter(flags)))
+
+    def _delete(self, control: str) -> None:
+        for child in self.children.pop(control, []):
+            self._delete(child)
+        for job, flags in list(self.jobs.items()):      # <- Run the uiDeleted script jobs watching the control
+            watched = flags.get("uiDeleted") or flags.get("uid")
+            if watched and watched[0] == control:
+                del self.jobs[job]
+                watched[1]()
+        self.controls.pop(control, None)
+        parent = self.parents.pop(control, None)
+        if parent is not None and control in self.children.get(parent, ()):
+            self.children[parent].remove(control)
+        if self.current_parent == control:
+            self.current_parent = parent or RecordingCmds.ROOT
+
+    def _setParent(self, path: str = None, edit=False, query=False, **flags):
+        if query or path is None:
+            return self.current_parent
+        self.current_parent = self.parents.get(self.current_parent, RecordingCmds.ROOT) if path == ".." else path
+        return self.current_parent
+
+    def _deleteUI(self, *controls, edit=False, query=False, **flags) -> None:
+        for control in controls:
+            for name in [control] if isinstance(control, str) else control:
+                self._delete(name)
+
+    def _window(self, name=None, edit=False, query=False, **flags):
+        if flags.get("exists") or flags.get("ex"):
+            return name in self.controls
+        if query:
+            return self._query(name, flags)
+        if edit:
+            return self._edit(name, flags)
+        self.current_parent = RecordingCmds.ROOT      # <- Windows are always top level
+        return self._create("window", name, flags)
+
+    def _warning(self, message: str = "", edit=False, query=False, **flags) -> None:
+        self.warnings.append(message)
+
+    def _scriptJob(self, edit=False, query=False, **flags):
+        job = flags.get("kill", flags.get("k"))
+        if job is not None:
+            del self.jobs[job]
+            return None
+        job = flags.get("exists", flags.get("ex"))
+        if job is not None:
+            return job in self.jobs
+        job = next(self._names)
+        self.jobs[job] = flags
+        return job
+
+    def _setAttr(self, plug: str, *values, edit=False, query=False, **flags) -> None:
+        self.attributes[plug] = values[0] if len(values) == 1 else list(values)
+
+    def _getAttr(self, plug: str, edit=False, query=False, **flags):
+        return self.attributes.get(plug)
+
+    def _showWindow(self, name=None, edit=False, query=False, **flags) -> None:
+        pass
+
+    def _textScrollList(self, name=None, edit=False, query=False, **flags):
+        if query:
+            return self._query(name, flags)
+        if not edit:
+            name = self._create("textScrollList", name, flags)
+        items = self.controls[name].setdefault("allItems", [])
+        if flags.pop("removeAll", False) or flags.pop("ra", False):
+            items.clear()
+        for item in flags.pop("removeItem", None) or flags.pop("ri", None) or ():
+            items.remove(item)
+        if "appendPosition" in flags:
+            position, item = flags.pop("appendPosition")
+            items.insert(position - 1, item)
+        appended = flags.pop("append", None) or flags.pop("a", None)
+        items.extend([appended] if isinstance(appended, str) else appended or ())
+        return self._edit(name, flags) if edit else name
+
+
+class _CmdsProxy:
+    """ Stand-in for the cmds module, every command is looked up on the active backend """
+
+    def __getattr__(self, command: str):
+        function = getattr(_active, command)
+        if lifecycle.current is not None:       # <- A panel is being built, its callbacks are registered with it
+            function = lifecycle.track(command, function)
+        return profiler.instrument(command, function) if profiler.enabled else function
+
+
+cmds = _CmdsProxy()
+""" The cmds module used by the widgets and the inspector, it forwards to the active backend """
+
+_active = maya_cmds
+_defer = maya_utils.executeDeferred if maya_utils else None
+
+
+def use(backend) -> object:
+    """ Make the backend active, it can be maya.cmds or a RecordingCmds, returns the previously active backend """
+    global _active, _defer
+    previous, _active = _active, backend
+    _defer = backend.defer if isinstance(backend, RecordingCmds) else maya_utils and maya_utils.executeDeferred
+    return previous
+
+
+@contextmanager
+def recording(recorder: RecordingCmds = None):
+    """ Make a RecordingCmds active within the block, a new one by default, the previously active backend comes back afterwards """
+    recorder = recorder or RecordingCmds()
+    previous = use(recorder)
+    try:
+        yield recorder
+    finally:
+        use(previous)
+
+
+def active() -> object:
+    """ Get the active backend """
+    return _active
+
+
+def defer(function, *args) -> None:
+    """ Run the function once the active backend is idle """
+    _defer(function, *args)
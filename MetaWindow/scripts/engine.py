@@ -1,7 +1,19 @@
 # noinspection PyProtectedMember
 from typing import Annotated, _AnnotatedAlias
-from collections import ChainMap
+from collections import ChainMap, deque
+from copy import copy
+from functools import partial, reduce
+from itertools import chain, repeat
+import sys
 from enum import Enum
+from types import MappingProxyType
+from weakref import WeakKeyDictionary, WeakSet, ref
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import traceback
+from backend import cmds, defer
+import lifecycle
+import profiler
 
 
 class LabelStyle(Enum):
@@ -9,7 +21,8 @@ class LabelStyle(Enum):
 
 
 class _MetaWidget(type):
-    """ this metaclass brings any widget class to completion, by filling up their custom dunder variables, and generating its __new__ method """
+    """ this metaclass brings any widget class to completion, it turns the class options into slots, fills up its custom dunder variables,
+        and generates its __new__ method, which interns the widget instances so identical specs share one immutable object """
 
     @staticmethod
     def is_dunder(name):
@@ -17,22 +30,67 @@ class _MetaWidget(type):
         return name.startswith("__") and name.endswith("__")
 
     @staticmethod
-    def generate_new_method(class_instance, T, label_style):
-        def __new__(cls, label, group="", **kwargs):
-            instance = super(class_instance, cls).__new__(cls)
-            if type(instance) is _AnnotatedAlias:
-                instance = instance.__metadata__[0]
+    def is_option(name, value):
+        """ Check if a class member is a widget option, options are the plain values declared in the class body """
+        return not _MetaWidget.is_dunder(name) and not callable(value) and not isinstance(value, (staticmethod, classmethod, property))
 
-            for key, arg in kwargs.items():
-                setattr(instance, key, arg)
+    @staticmethod
+    def freeze(value):
+        """ Hashable equivalent of an option value, used to recognize identical specs, every component records its type,
+            so a list and a dict holding the same items, or 0 and 0.0, are different specs """
+        if isinstance(value, (list, tuple)):
+            return type(value), tuple(map(_MetaWidget.freeze, value))
+        if isinstance(value, (set, frozenset)):
+            return type(value), frozenset(map(_MetaWidget.freeze, value))
+        if isinstance(value, dict):
+            return type(value), tuple((_MetaWidget.freeze(key), _MetaWidget.freeze(item)) for key, item in value.items())
+        return type(value), value
 
-            instance.__label_style__ = label_style
-            instance.__label__ = label
-            instance.__group__ = group
-            instance.__type__ = T
+    @staticmethod
+    def frozen_copy(value):
+        """ Immutable copy of an option value, shared widgets hold it instead of the mutable container given by their first caller """
+        if isinstance(value, (list, tuple)):
+            return tuple(map(_MetaWidget.frozen_copy, value))
+        if isinstance(value, (set, frozenset)):
+            return frozenset(map(_MetaWidget.frozen_copy, value))
+        if isinstance(value, dict):
+            return MappingProxyType({key: _MetaWidget.frozen_copy(item) for key, item in value.items()})
+        return value
+
+    @staticmethod
+    def generate_new_method(class_instance, T, label_style):
+        options = class_instance.__options__
+        interned = class_instance.__interned__
+
+        def __new__(cls, label, group="", **kwargs):
+            values = options
+            if kwargs:
+                unknown = kwargs.keys() - options.keys()
+                if unknown:
+                    raise TypeError(f"{cls.__name__} got unexpected options {', '.join(sorted(unknown))}")
+                values = {**options, **kwargs}
+
+            try:
+                key = label, group, tuple(_MetaWidget.freeze(value) for value in values.values())
+                hash(key)
+            except TypeError:                   # <- An option can't be compared, this spec is never shared
+                key = None
+            else:
+                annotation = interned.get(key)
+                if annotation is not None:      # <- The very same spec was already declared, share it
+                    return annotation
+
+            instance = object.__new__(cls)
+            for name, value in values.items():
+                object.__setattr__(instance, name, value if key is None else _MetaWidget.frozen_copy(value))    # <- A shared spec can't be edited through its caller's containers
+            object.__setattr__(instance, "__label__", label)
+            object.__setattr__(instance, "__group__", group)
 
             # build an annotation with the args
-            return Annotated[T, instance]
+            annotation = Annotated[T, instance]
+            if key is not None:
+                interned[key] = annotation
+            return annotation
 
         def unlabeled_new(cls, group="", **kwargs):
             return __new__(cls, None, group, **kwargs)
@@ -43,6 +101,15 @@ class _MetaWidget(type):
         return unlabeled_new if label_style == LabelStyle.Off else labeled_new
 
     def __new__(mcs, name, bases, members, T=None, label_style=LabelStyle.Left):
+        inherited = dict(ChainMap(*(getattr(base, "__options__", {}) for base in bases)))
+        declared = {key: members.pop(key) for key, value in list(members.items()) if _MetaWidget.is_option(key, value)}
+
+        members["__slots__"] = tuple(members.get("__slots__", ())) + tuple(key for key in declared if key not in inherited)    # <- Overridden options reuse the base's slot
+        members["__options__"] = {**inherited, **declared}
+        members["__interned__"] = {}
+        members["__type__"] = T
+        members["__label_style__"] = label_style
+
         # Define the new class
         class_instance = super().__new__(mcs, name, bases, members)
 
@@ -52,12 +119,14 @@ class _MetaWidget(type):
 
 
 class Widget(metaclass=_MetaWidget):
-    """ Base widget class """
+    """ Base widget class, its instances are immutable and shared between every field declaring the same spec """
+
+    __slots__ = "__label__", "__group__", "__weakref__"
 
-    __label__ = ""
+    __label__: str
     """ Widget's label text """
 
-    __group__ = ""
+    __group__: str
     """ Widget's group name """
 
     __type__ = None
@@ -66,44 +135,479 @@ class Widget(metaclass=_MetaWidget):
     __label_style__ = LabelStyle.Left
     """ The widgets label style, currently can be set to None, Top or Left """
 
+    __options__: dict = {}
+    """ The widget's options and their default values, gathered from the class bodies """
+
+    __interned__: dict = {}
+    """ Every annotation built from this class, keyed by its label, group and option values """
+
+    asynchronous = False
+    """ Write the field from a worker thread, for setters doing heavy work such as a bake or file io, the setter must not touch maya """
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} instances are shared between fields and can't be modified")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} instances are shared between fields and can't be modified")
+
+    def __values__(self) -> dict:
+        """ The widget's label, group and option values """
+        return {"__label__": self.__label__, "__group__": self.__group__, **{name: getattr(self, name) for name in self.__options__}}
+
     def __widget__(self, bind, default):
-        """ Cmds Method that build the widget in maya """
+        """ Cmds Method that build the widget in maya, it returns the widget's controls """
         print("Abstract method invoked directly")
 
+    def __update__(self, bind, controls):
+        """ Cmds Method that pushes the bound value into the widget's existing controls """
+        pass
+
+
+class Bind:
+    """ This class is the path to reach a variable's reference in memory, the object containing the variable and the variable's name,
+        widgets read and write through it, and it can be pointed at another object without rebuilding the widgets holding it """
+
+    __slots__ = "_target", "field_name", "on_set"
+
+    def __init__(self, target: object, field_name: str) -> None:
+        self.target = target
+        self.field_name = field_name
+        self.on_set = None
+
+    @property
+    def target(self) -> object:
+        """ The object containing the variable, it is held weakly, so the callbacks holding this bind never keep it alive """
+        target = self._target
+        if type(target) is ref:
+            target = target()
+            if target is None:
+                raise ReferenceError(f"The object holding {self.field_name} no longer exists")
+        return target
+
+    @target.setter
+    def target(self, target: object) -> None:
+        try:
+            self._target = ref(target)
+        except TypeError:                       # <- Objects without weak reference support are held strongly
+            self._target = target
+
+    def __iter__(self):
+        """ Unpacks as (target, field_name), so setattr(*bind, value) keeps working """
+        yield self.target
+        yield self.field_name
+
+    def get(self):
+        """ Read the variable """
+        return getattr(self.target, self.field_name)
+
+    def set(self, value) -> None:
+        """ Write the variable, then call on_set, if any """
+        self._write(value)
+        if self.on_set is not None:
+            self.on_set()
+
+    def _write(self, value) -> None:
+        if profiler.enabled:
+            profiler.write(self, value)
+        else:
+            setattr(self.target, self.field_name, value)
+
+
+_EMPTY = object()
+
+
+class AsyncBind(Bind):
+    """ This class is a bind whose writes run in a worker pool, writes to one field run one at a time and in order, a value arriving while a write runs
+        waits for it and supersedes any value already waiting, so a burst of edits ends with at most two writes, once the field settles
+        on_done receives the last error, if any, on maya's main thread """
+
+    __slots__ = "on_done", "_lock", "_waiting", "_running", "_error"
+
+    executor: ThreadPoolExecutor = None
+    """ Worker pool shared by every asynchronous bind, created on first use """
+
+    written_total = 0
+    """ Writes run across every asynchronous bind """
+
+    superseded_total = 0
+    """ Values dropped across every asynchronous bind, replaced by a newer one before their write started """
+
+    def __init__(self, target: object, field_name: str, on_done=None) -> None:
+        super().__init__(target, field_name)
+        self.on_done = on_done
+        self._lock = Lock()
+        self._waiting = _EMPTY
+        self._running = _EMPTY
+        self._error = None
+
+    def get(self):
+        """ Read the variable, or the value on its way to it, so widgets editing the value in place build on their latest edit """
+        waiting, running = self._waiting, self._running
+        return waiting if waiting is not _EMPTY else running if running is not _EMPTY else getattr(self.target, self.field_name)
+
+    def set(self, value) -> None:
+        """ Queue a write, the call returns right away """
+        with self._lock:
+            if self._waiting is not _EMPTY:     # <- Never started, it will never be seen
+                AsyncBind.superseded_total += 1
+            self._waiting = value
+            if self._running is not _EMPTY:     # <- The running write will pick it up once done
+                return
+            self._running = value
+        if AsyncBind.executor is None:
+            AsyncBind.executor = ThreadPoolExecutor(thread_name_prefix="async_bind")
+        AsyncBind.executor.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                value, self._waiting = self._waiting, _EMPTY
+                if value is _EMPTY:             # <- Settled
+                    self._running = _EMPTY
+                    error, self._error = self._error, None
+                    break
+                self._running = value
+            try:
+                Bind._write(self, value)       # <- on_set runs on the main thread, through on_done
+                self._error = None
+            except Exception as exception:      # <- Reported on the main thread, a newer successful write clears it
+                self._error = exception
+            AsyncBind.written_total += 1
+        if self.on_done is not None:
+            defer(self.on_done, error)
+
 
 class Fragment:
     """ This class is an organized metadata info blob referred to a single variable field contained in a major object,
         Many metadata fragments account for an object's full fields meta reflection """
 
     def __init__(self, target_ref: object, field_name: str, default_value: object, data: Widget) -> None:
-        self.bind: tuple[object, str] = target_ref, field_name
+        self.bind: Bind = AsyncBind(target_ref, field_name, self.on_written) if data.asynchronous else Bind(target_ref, field_name)
         """ The bind, represents the path to reach this variable's reference in memory, its represented by the object containing the variable and the variable's name """
+        self.bind.on_set = self.on_set
 
         self.default: object = default_value
         """ This value refer to the variable's default value """
 
         self.data: Widget = data
 
+        self.controls = None
+        """ Whatever the widget's __widget__ returned, None until the widget is built and once its panel is released """
+
+        self.label_element: str = None
+        """ The label control built along with the widget, if any """
+
+        self.row_element: str = None
+        """ The layout holding the label and the widget, panel searches show or hide it, None until the widget is built """
+
+        self.observed: bool = False
+        """ Whether writes to the bound field refresh this fragment """
+
+        self.mixed: bool = False
+        """ Whether the label shows the mixed values marker """
+
+        self.owner = None
+        """ The panel holding this fragment, the callbacks of the controls created by a refresh are registered with it, and it updates the fragment's label """
+
     def build_widget(self):
-        self.data.__widget__(self.bind, self.default)
+        """ Build the widget's controls showing the bound value, not the class default, so a built panel and a rebound one look the same """
+        if profiler.enabled:
+            self.controls = profiler.build(self, lambda: self.data.__widget__(self.bind, self.bind.get()))
+        else:
+            self.controls = self.data.__widget__(self.bind, self.bind.get())
+
+    def refresh(self):
+        """ Push the bound value into the widget's controls, if they were built and not released since """
+        if self.controls is None:
+            return
+        with lifecycle.owned_by(self.owner):        # <- Refreshes run from idle flushes and rebinds, outside of the panel's build
+            self.data.__update__(self.bind, self.controls)
+        if self.owner is not None and (self.mixed or isinstance(self.bind.target, MultiTarget)):   # <- The targets may have been written apart, or together
+            self.owner.relabel(self)
+
+    def on_set(self):
+        """ Called after every write made by the widget, a write to many targets leaves them holding the same value, so the mixed values marker goes """
+        if self.mixed and self.owner is not None:
+            self.owner.relabel(self)
+
+    def on_written(self, error: Exception = None):
+        """ Called on the main thread once an asynchronous field settles, the controls show the value that was actually written,
+            nothing is left to do once the panel holding the fragment is released """
+        if self.controls is None:
+            return
+        if error is not None:
+            cmds.warning(f"Failed to write {self.bind.field_name}: {''.join(traceback.format_exception_only(type(error), error)).strip()}")
+        self.refresh()
+
+    def observe(self):
+        """ Install an ObservableField over the bound field and watch it, so writes made by anyone refresh this fragment's controls,
+            proxy targets, such as node targets, are skipped, their fields don't live on their class """
+        target, field_name = self.bind
+        for instance in target.targets if isinstance(target, MultiTarget) else (target,):
+            if inspected_class(instance) is not type(instance):     # <- A descriptor on the proxy's class would hide the proxy's own lookup
+                continue
+            field = ObservableField.of(type(instance), field_name)
+            field.watch(instance, self)         # <- Watch first, so a failure leaves the class untouched
+            ObservableField.install(type(instance), field_name, field)
+        self.observed = True
+
+    def unobserve(self):
+        """ Stop watching the bound field """
+        target, field_name = self.bind
+        for instance in target.targets if isinstance(target, MultiTarget) else (target,):
+            field = next((c.__dict__[field_name] for c in type(instance).__mro__ if field_name in c.__dict__), None)
+            if isinstance(field, ObservableField):
+                field.unwatch(instance, self)
+        self.observed = False
+
+    def rebind(self, target_ref: object):
+        """ Point this fragment at another object and push its value into the existing controls """
+        observed = self.observed
+        if observed:
+            self.unobserve()
+        self.bind.target = target_ref
+        if observed:
+            self.observe()
+        self.refresh()
+
+    @property
+    def is_mixed(self) -> bool:
+        """ Check if this fragment is bound to many targets that hold different values """
+        target, field_name = self.bind
+        return isinstance(target, MultiTarget) and target.is_mixed(field_name)
 
     @staticmethod
     def extract_reflection(target: object) -> dict[str, list]:
         """ Extract the reflection from the target's instance and populate a dictionary of fragments """
-        fragment_groups = {}
-        ungrouped_fragments = []
-        defaults_values = ChainMap(*(c.__dict__ for c in type(target).__mro__))
+        return Schema.of(inspected_class(target)).bind(target)
 
-        for field_name, field_metadata in ChainMap(*(c.__annotations__ for c in type(target).__mro__ if '__annotations__' in c.__dict__)).items():  # For each metadata blob acquired from the target
+
+IMMUTABLE_TYPES = (int, float, complex, str, bytes, bool, tuple, frozenset, type(None), Enum)
+""" Values of these types are safe to share between targets, anything else is copied per target on batched writes """
+
+
+def latest_class(cls: type) -> type:
+    """ Get the class currently defined under the class's module and qualified name, it differs from the class once its module got reloaded """
+    try:
+        return reduce(getattr, cls.__qualname__.split("."), sys.modules[cls.__module__])
+    except (KeyError, AttributeError):
+        return cls
+
+
+def inspected_class(target: object) -> type:
+    """ Get the class whose reflection describes the target, proxies expose it through __inspected_class__ """
+    return target.__inspected_class__ if hasattr(type(target), "__inspected_class__") else type(target)
+
+
+def batch_set(targets, field_name: str, value, same_class: bool = False) -> None:
+    """ Write the same value to the field of every target in one pass, a property's or data descriptor's setter is resolved once instead of once per target
+        and the writes are driven by map, plain attributes and classes overriding __setattr__ go through setattr, mutable values are copied so targets never share them,
+        same_class skips checking that every target shares the first target's class """
+    targets = targets if isinstance(targets, (list, tuple)) else list(targets)
+    if not targets:
+        return
+
+    immutable = isinstance(value, IMMUTABLE_TYPES)
+    cls = type(targets[0])
+    descriptor = None
+    if cls.__setattr__ is object.__setattr__ and (same_class or all(type(target) is cls for target in targets)):     # <- A custom __setattr__ must see every write
+        descriptor = next((c.__dict__[field_name] for c in cls.__mro__ if field_name in c.__dict__), None)
+
+    if isinstance(descriptor, property) and descriptor.fset:
+        setter = descriptor.fset                                                        # <- Properties, call their setter directly
+    elif hasattr(type(descriptor), "__set__"):
+        setter = partial(type(descriptor).__set__, descriptor)                          # <- Any other data descriptor
+    elif immutable:
+        for target in targets:                                                          # <- Plain attributes, a loop beats any resolved setter
+            setattr(target, field_name, value)
+        return
+    else:
+        setter = lambda target, item: setattr(target, field_name, item)
+
+    values = repeat(value) if immutable else chain((value,), map(copy, repeat(value, len(targets) - 1)))
+    deque(map(setter, targets, values), maxlen=0)
+
+
+class MultiTarget:
+    """ This class is a proxy over many targets of the same class, reads come from the first target and writes go to every target in one batched pass """
+
+    def __init__(self, targets) -> None:
+        targets = tuple(targets)
+        if not targets:
+            raise ValueError("MultiTarget needs at least one target")
+        if any(type(target) is not type(targets[0]) for target in targets):
+            raise TypeError(f"MultiTarget targets must share the same class, {type(targets[0]).__name__} expected")
+        object.__setattr__(self, "targets", targets)
+
+    @property
+    def __inspected_class__(self) -> type:
+        return type(self.targets[0])
+
+    def __getattr__(self, name):
+        return getattr(self.targets[0], name)
+
+    def __setattr__(self, name, value) -> None:
+        batch_set(self.targets, name, value, same_class=True)
+
+    def is_mixed(self, field_name: str) -> bool:
+        """ Check if the targets hold different values for the field """
+        first = getattr(self.targets[0], field_name)
+        return any(getattr(target, field_name) != first for target in self.targets[1:])
+
+
+class ObservableField:
+    """ This data descriptor replaces an inspected field, every write marks the fragments watching the written instance as dirty,
+        dirty fragments are refreshed once, on the next idle cycle, no matter how many writes happened """
+
+    _dirty = set()
+    """ Fragments waiting for the next flush """
+
+    def __init__(self, field_name: str, default=None, inner=None) -> None:
+        self.field_name: str = field_name
+        self.default = default
+        """ The field's class level default value """
+
+        self.inner = inner
+        """ The data descriptor this field replaced, such as a property, reads and writes are delegated to it """
+
+        self.watchers: dict[int, tuple] = {}
+        """ A reference to each watched instance and the fragments watching it, by instance identity, so unhashable instances such as dataclasses can be watched,
+            the entry goes away along with its instance """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.inner is not None:
+            return self.inner.__get__(instance, owner)
+        return instance.__dict__.get(self.field_name, self.default)
+
+    def __set__(self, instance, value) -> None:
+        if self.inner is not None:
+            self.inner.__set__(instance, value)
+        else:
+            instance.__dict__[self.field_name] = value
+
+        entry = self.watchers.get(id(instance))
+        fragments = entry[1] if entry is not None else None
+        if fragments:
+            if not ObservableField._dirty:      # <- First write since the last flush, schedule one
+                defer(ObservableField.flush)
+            ObservableField._dirty.update(fragments)
+
+    def watch(self, instance, fragment: Fragment) -> None:
+        """ Refresh the fragment whenever the instance's field is written """
+        key = id(instance)
+        entry = self.watchers.get(key)
+        if entry is None:
+            try:
+                holder = ref(instance, lambda _, watchers=self.watchers, key=key: watchers.pop(key, None))
+            except TypeError:                   # <- Objects without weak reference support are held until unwatched
+                holder = instance
+            entry = self.watchers[key] = holder, WeakSet()
+        entry[1].add(fragment)
+
+    def unwatch(self, instance, fragment: Fragment) -> None:
+        """ Stop refreshing the fragment when the instance's field is written """
+        entry = self.watchers.get(id(instance))
+        if entry is not None:
+            entry[1].discard(fragment)
+            if not entry[1]:
+                del self.watchers[id(instance)]
+
+    @staticmethod
+    def of(cls: type, field_name: str) -> "ObservableField":
+        """ Get the class's observable field, or a new one over the field's current attribute or descriptor, which is not installed yet """
+        current = next((c.__dict__[field_name] for c in cls.__mro__ if field_name in c.__dict__), None)
+        if isinstance(current, ObservableField):
+            return current
+        return ObservableField(field_name, inner=current) if hasattr(type(current), "__set__") else ObservableField(field_name, default=current)
+
+    @staticmethod
+    def install(cls: type, field_name: str, field: "ObservableField" = None) -> "ObservableField":
+        """ Get the class's observable field, replacing the field's current attribute or descriptor with one if needed,
+            field is the observable field to install, a new one by default """
+        field = field or ObservableField.of(cls, field_name)
+        if next((c.__dict__[field_name] for c in cls.__mro__ if field_name in c.__dict__), None) is not field:
+            setattr(cls, field_name, field)
+        return field
+
+    @staticmethod
+    def flush() -> None:
+        """ Refresh every dirty fragment once """
+        dirty, ObservableField._dirty = ObservableField._dirty, set()
+        for fragment in dirty:
+            fragment.refresh()
+
+
+class Schema:
+    """ This class is a compiled reflection of a single class, it holds the class's ordered groups of (field name, metadata, default value) entries,
+        it is built once per class and cached, so binding it to an instance only costs O(fields) """
+
+    _cache = WeakKeyDictionary()
+    """ Compiled schemas, keyed by their class, entries die along with the class they describe (on redefinition or module reload) """
+
+    def __init__(self, cls: type) -> None:
+        self._mro_ids: tuple[int, ...] = tuple(id(c) for c in cls.__mro__)
+        """ Identity of the class's mro at compile time, used to detect changed bases """
+
+        self._annotations: tuple = tuple(c.__dict__.get('__annotations__') for c in cls.__mro__)
+        """ Identity of every annotation dictionary at compile time, used to detect redefined annotations """
+
+        self.groups: dict[str, tuple[tuple[str, Widget, object], ...]] = {}
+        """ Ordered groups of (field name, metadata, default value) entries, the ungrouped entries are stored at the end under the "" key """
+
+        grouped_entries = {}
+        ungrouped_entries = []
+        defaults_values = ChainMap(*(c.__dict__ for c in cls.__mro__))
+
+        for field_name, field_metadata in ChainMap(*(c.__annotations__ for c in cls.__mro__ if '__annotations__' in c.__dict__)).items():  # For each metadata blob acquired from the class
             if not isinstance(field_metadata, _AnnotatedAlias):
                 continue
             instance = field_metadata.__metadata__[0]
             if not issubclass(type(instance), Widget):
                 continue
 
-            fragment = Fragment(target, field_name, defaults_values[field_name], instance)  # Build the reflection fragment using the metadata blob
-            (fragment_groups.setdefault(fragment.data.__group__, []) if fragment.data.__group__ else ungrouped_fragments).append(fragment)  # adds it to the groups or ungroup if it has a group
+            default = defaults_values[field_name]
+            if isinstance(default, ObservableField):        # <- The field is being observed, its class level default lives in the descriptor
+                default = default.default
+            entry = field_name, instance, default
+            (grouped_entries.setdefault(instance.__group__, []) if instance.__group__ else ungrouped_entries).append(entry)  # adds it to the groups or ungroup if it has a group
+
+        if ungrouped_entries:  # Append the ungrouped entries at the end of the group's dictionary
+            grouped_entries[""] = ungrouped_entries
+        self.groups = {group_name: tuple(entries) for group_name, entries in grouped_entries.items()}
+
+        self.fields: tuple[str, ...] = tuple(field_name for entries in self.groups.values() for field_name, _, _ in entries)
+        """ Every reflected field name, in display order """
 
-        if ungrouped_fragments:  # Append the ungrouped fragments at the end of the fragment group's dictionary
-            fragment_groups[""] = ungrouped_fragments
-        return fragment_groups
+        self.signature: tuple = tuple((group_name, field_name, type(data).__qualname__, tuple(sorted((key, repr(value)) for key, value in data.__values__().items())), repr(default))
+                                      for group_name, entries in self.groups.items() for field_name, data, default in entries)
+        """ Description of the schema made only of names and reprs, it compares equal across module reloads unless the schema actually changed """
+
+    def is_current(self, cls: type) -> bool:
+        """ Check if this schema still describes the given class, it goes stale if the class's bases or annotation dictionaries were swapped """
+        mro = cls.__mro__
+        return (len(mro) == len(self._mro_ids)
+                and all(id(c) == i for c, i in zip(mro, self._mro_ids))
+                and all(c.__dict__.get('__annotations__') is a for c, a in zip(mro, self._annotations)))
+
+    def bind(self, target: object) -> dict[str, list[Fragment]]:
+        """ Bind this schema to an instance, building a dictionary of fragments """
+        return {group_name: [Fragment(target, field_name, default, data) for field_name, data, default in entries]
+                for group_name, entries in self.groups.items()}
+
+    @staticmethod
+    def of(cls: type) -> "Schema":
+        """ Get the class's compiled schema, compiling it if it is missing or stale """
+        schema = Schema._cache.get(cls)
+        if schema is None or not schema.is_current(cls):
+            schema = Schema._cache[cls] = Schema(cls)
+        return schema
+
+    @staticmethod
+    def invalidate(cls: type = None) -> None:
+        """ Drop the class's compiled schema, or every compiled schema if no class is given, use it after mutating a class in place """
+        if cls is None:
+            Schema._cache.clear()
+        else:
+            Schema._cache.pop(cls, None)
@@ -0,0 +1,190 @@
+import re
+from bisect import bisect_left, insort
+
+
+class SortedIndex:
+    """ This class is a sorted, duplicate free list of strings, every change reports the positions it touched,
+        so list widgets mirroring it can be edited one entry at a time instead of being rebuilt """
+
+    def __init__(self, items=()) -> None:
+        self.items: list[str] = sorted(set(items))
+        """ The indexed strings, in display order """
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item: str) -> bool:
+        position = bisect_left(self.items, item)
+        return position < len(self.items) and self.items[position] == item
+
+    def insert(self, items) -> list[tuple[int, str]]:
+        """ Insert the missing items, returns the (position, item) pairs inserted, positions are valid when applied in order """
+        inserted = []
+        for item in items:
+            position = bisect_left(self.items, item)
+            if position == len(self.items) or self.items[position] != item:     # <- Skip the items already indexed
+                self.items.insert(position, item)
+                inserted.append((position, item))
+        return inserted
+
+    def remove(self, items) -> list[tuple[int, str]]:
+        """ Remove the present items, returns the (position, item) pairs removed, positions are valid when applied in order """
+        removed = []
+        for item in items:
+            position = bisect_left(self.items, item)
+            if position < len(self.items) and self.items[position] == item:     # <- Skip the items not indexed
+                del self.items[position]
+                removed.append((position, item))
+        return removed
+
+
+class SearchIndex(SortedIndex):
+    """ This class is a sorted index that also answers prefix and substring searches, substring searches go through a suffix array,
+        built on the first substring search and kept up to date by every later change """
+
+    SEPARATOR = "\0"
+    """ Separates a suffix from the item it was cut from, it sorts before every character found in a node name """
+
+    LAST = "\U0010ffff"
+    """ Sorts after every character, appended to a search to find the end of its matching range """
+
+    def __init__(self, items=()) -> None:
+        super().__init__(items)
+        self._suffixes: list[str] | None = None
+
+    @staticmethod
+    def _suffix_keys(item: str):
+        return (f"{item[start:]}{SearchIndex.SEPARATOR}{item}" for start in range(len(item)))
+
+    def insert(self, items) -> list[tuple[int, str]]:
+        inserted = super().insert(items)
+        if self._suffixes is not None:
+            for _, item in inserted:
+                for key in SearchIndex._suffix_keys(item):
+                    insort(self._suffixes, key)
+        return inserted
+
+    def remove(self, items) -> list[tuple[int, str]]:
+        removed = super().remove(items)
+        if self._suffixes is not None:
+            for _, item in removed:
+                for key in SearchIndex._suffix_keys(item):
+                    del self._suffixes[bisect_left(self._suffixes, key)]
+        return removed
+
+    def prefix(self, prefix: str) -> range:
+        """ Positions of the items starting with prefix, O(log n) """
+        return range(bisect_left(self.items, prefix), bisect_left(self.items, prefix + SearchIndex.LAST))
+
+    def substring(self, query: str) -> list[str]:
+        """ The items containing query, sorted, O(log n + k) where k is the number of places query was found """
+        if self._suffixes is None:
+            self._suffixes = sorted(key for item in self.items for key in SearchIndex._suffix_keys(item))
+        start = bisect_left(self._suffixes, query)
+        end = bisect_left(self._suffixes, query + SearchIndex.LAST)
+        return sorted({key.rpartition(SearchIndex.SEPARATOR)[2] for key in self._suffixes[start:end]})
+
+
+class Pager:
+    """ This class is a page sized window over a search index, filtered by a search query, only the items in the window are ever copied,
+        a query ending with * matches the start of the items, any other query matches anywhere in them """
+
+    def __init__(self, index: SearchIndex, page_size: int) -> None:
+        self.index = index
+        """ The paged items """
+
+        self.page_size = page_size
+        """ Number of items in a page """
+
+        self.query: str = ""
+        """ Current search, every item matches an empty search """
+
+        self.page: int = 0
+        """ Current page number, starting at 0 """
+
+        self._matches: list[str] | None = None
+
+    def _source(self) -> tuple[list[str], int, int]:
+        """ The sorted list holding the matches, with the range they span in it """
+        if not self.query:
+            return self.index.items, 0, len(self.index.items)
+        if self.query.endswith("*"):            # <- Prefix matches are a range of the index itself, nothing is copied
+            matches = self.index.prefix(self.query[:-1])
+            return self.index.items, matches.start, matches.stop
+        if self._matches is None:               # <- Substring matches are gathered once per query, then every page is a slice of them
+            self._matches = self.index.substring(self.query)
+        return self._matches, 0, len(self._matches)
+
+    def __len__(self) -> int:
+        _, start, end = self._source()
+        return end - start
+
+    def search(self, query: str) -> None:
+        """ Filter the items, back to the first page """
+        self.query, self.page, self._matches = query, 0, None
+
+    def refresh(self) -> None:
+        """ Forget the gathered matches, call it once the index changed """
+        self._matches = None
+
+    def turn(self, pages: int) -> None:
+        """ Move by a number of pages, backwards if negative, the window stays within the matches """
+        self.page = max(0, min(self.page + pages, (len(self) - 1) // self.page_size))
+
+    def window(self) -> list[str]:
+        """ Items of the current page """
+        items, start, end = self._source()
+        self.page = max(0, min(self.page, (end - start - 1) // self.page_size))     # <- The matches may have shrunk since the last turn
+        first = start + self.page * self.page_size
+        return items[first:min(first + self.page_size, end)]
+
+
+class FieldIndex:
+    """ This class finds the rows matching a search, each row is described by a few texts, such as a field's name, label and group,
+        the texts are lower cased and indexed once, a query ending with * matches the start of a text, a query starting with ~ matches
+        its characters in order anywhere in a text, any other query matches anywhere in a text, searches ignore case """
+
+    def __init__(self, rows) -> None:
+        self.positions: dict[str, list[int]] = {}
+        """ Positions of the rows described by each text """
+
+        for position, texts in enumerate(rows):
+            for text in texts:
+                if text:
+                    self.positions.setdefault(text.lower(), []).append(position)
+
+        self.index: SearchIndex = SearchIndex(self.positions)
+        """ The texts, sorted """
+
+        self._fuzzy: tuple[str, list[str]] = ("", self.index.items)
+
+    def texts(self, query: str) -> list[str]:
+        """ The texts matching the query """
+        query = query.lower()
+        if query.endswith("*"):
+            matches = self.index.prefix(query[:-1])
+            return self.index.items[matches.start:matches.stop]
+        if query.startswith("~"):
+            query = query[1:]
+            previous, candidates = self._fuzzy
+            if not query.startswith(previous):  # <- Typing narrows the last fuzzy matches, anything else starts over
+                candidates = self.index.items
+            pattern = re.compile(".*?".join(map(re.escape, query)))
+            matches = list(filter(pattern.search, candidates))
+            self._fuzzy = query, matches
+            return matches
+        return self.index.substring(query)
+
+    def match(self, query: str) -> set[int] | None:
+        """ Positions of the rows matching the query, None if the query is empty, every row matches it """
+        if not query.strip("*~ "):
+            return None
+        return {position for text in self.texts(query.strip()) for position in self.positions[text]}
+
+
+def ordered_diff(old_keys, new_keys) -> tuple[list, list]:
+    """ Compare two insertion ordered dictionaries or key views, returns the keys removed from old_keys and the keys added by new_keys, both in their original order """
+    return [key for key in old_keys if key not in new_keys], [key for key in new_keys if key not in old_keys]
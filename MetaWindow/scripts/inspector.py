@@ -1,33 +1,246 @@
+from collections import Counter
 import engine
-from maya import cmds
+import lifecycle
+from backend import cmds
+from index import FieldIndex
+from scheduler import Debouncer
+from weakref import WeakKeyDictionary
 
 
-def create_panel(ref, label_size, *args, **kwargs) -> str:
-    """ Command that creates a tuning panel widget """
-    root_element = cmds.columnLayout(*args, **kwargs)
+MIXED_SUFFIX = " *"
+""" Appended to the label of fields whose targets hold mixed values """
 
-    # Extract the target_ref's reflection and build frame layouts for each category
-    for group_name, fragments in engine.Fragment.extract_reflection(ref).items():
+SEARCH_HINT = "Search fields, name* matches the start, ~nme matches the letters in order"
+""" Placeholder text of the panels' search box """
+
+
+def label_text(fragment: engine.Fragment) -> tuple[str, str]:
+    """ Get the fragment's (label, annotation) texts, and record on the fragment whether they carry the mixed values marker """
+    label = f"{fragment.data.__label__.title()}:"
+    fragment.mixed = fragment.is_mixed
+    if fragment.mixed:
+        return label + MIXED_SUFFIX, "The inspected objects hold mixed values, editing it overwrites all of them"
+    return label, ""
+
+
+def build_fragment(fragment: engine.Fragment, label_size: int) -> None:
+    """ Build a single fragment's widget, along with its label """
+    if fragment.data.__label__:
+        label, annotation = label_text(fragment)
+
+        if fragment.data.__label_style__ == engine.LabelStyle.Left:
+            fragment.row_element = cmds.rowLayout(numberOfColumns=2, adjustableColumn2=2, columnWidth2=(label_size, 70), columnAlign2=["right", "left"], columnAttach2=["both", "right"])
+            fragment.label_element = cmds.text(label=label, annotation=annotation, align="right", font="boldLabelFont")
+            fragment.build_widget()
+            cmds.setParent("..")
+
+        elif fragment.data.__label_style__ == engine.LabelStyle.Top:
+            fragment.row_element = cmds.columnLayout(adj=True)
+            fragment.label_element = cmds.text(label=label, annotation=annotation, align="left", font="boldLabelFont")
+            fragment.build_widget()
+            cmds.setParent("..")
+    elif not fragment.data.__label__ or fragment.data.__label_style__ == engine.LabelStyle.Off:
+        fragment.row_element = cmds.columnLayout(adj=True)     # <- A row to show or hide, even without a label
+        fragment.build_widget()
+        cmds.setParent("..")
+
+
+def build_group(layout_element: str, fragments: list, label_size: int) -> None:
+    """ Build every fragment of a group inside the given layout """
+    cmds.setParent(layout_element)
+    for fragment in fragments:
+        build_fragment(fragment, label_size)
+
+
+class Panel(str):
+    """ This class is a tuning panel's root element name, that also remembers what the panel shows, so it can be rebuilt in place """
+
+    def __new__(cls, root_element: str, ref, label_size: int, lazy=False, collapsed=False, observe=False, compiled=False, searchable=False):
+        panel = super().__new__(cls, root_element)
+        panel.ref = ref
+        """ The inspected object """
+
+        panel.label_size = label_size
+        panel.lazy = lazy
+        panel.collapsed = collapsed
+        panel.observe = observe
+        panel.compiled = compiled
+        panel.searchable = searchable
+
+        panel.signature = None
+        """ Signature of the schema the panel was built from """
+
+        panel.fragment_groups = {}
+        """ The panel's fragments, by group name """
+
+        panel.callbacks = []
+        """ Handles of every callback installed by the panel's widgets, released along with the panel """
+
+        panel.frames = {}
+        """ The frame layout of every named group, by group name """
+
+        panel.index = None
+        """ Index of the field names, labels and groups, shared by every panel of the same schema """
+
+        panel.query = ""
+        """ The current search, every field is shown for an empty search """
+
+        panel.hidden = set()
+        """ Positions of the fields hidden by the current search, in display order """
+
+        panel.hidden_groups = set()
+        """ Names of the groups hidden by the current search, none of their fields match it """
+
+        panel.search_element = None
+        """ The search box, if the panel is searchable """
+
+        panel._rows, panel._groups, panel._hidden_counts = [], [], Counter()
+        return panel
+
+    @property
+    def fragments(self):
+        """ Every fragment of the panel, in display order """
+        return [fragment for fragments in self.fragment_groups.values() for fragment in fragments]
+
+    def populate(self, schema: engine.Schema) -> None:
+        """ Build the schema's widgets bound to the inspected object inside this panel, which must be empty """
+        self.signature = schema.signature
+        self.fragment_groups = schema.bind(self.ref)
+        self.index = field_index(schema)
+        self.query, self.hidden, self.hidden_groups, self._hidden_counts = "", set(), set(), Counter()
+        self._rows = self.fragments
+        self._groups = [group_name for group_name, fragments in self.fragment_groups.items() for _ in fragments]
+        for fragment in self._rows:
+            fragment.owner = self
+        with lifecycle.owned_by(self):
+            if self.searchable:
+                cmds.setParent(self)
+                self.search_element = cmds.textField(placeholderText=SEARCH_HINT, textChangedCommand=lambda text, *_: self.search(text))
+            if self.compiled and not self.lazy:     # <- Lazy panels build group by group, they keep the interpreted path
+                self.frames = builder(schema)(self, self.fragment_groups, self.label_size, self.collapsed, isinstance(self.ref, engine.MultiTarget))
+            else:
+                self.frames = populate_panel(self, self.fragment_groups, self.label_size, self.lazy, self.collapsed, on_built=self._hide_built)
+        if self.observe:
+            for fragment in self.fragments:
+                fragment.observe()
+
+    def rebind(self, ref) -> None:
+        """ Point the panel at another object of the same class, the controls are kept and only receive the new values \n
+            ref can be a single object or a collection of objects of the same class
+        """
+        if isinstance(ref, (list, tuple, set, frozenset)):
+            ref = engine.MultiTarget(ref)
+        if engine.Schema.of(engine.inspected_class(ref)).signature != self.signature:
+            raise TypeError(f"This panel can't show a {engine.inspected_class(ref).__name__}, its schema differs from the one the panel was built from")
+
+        self.ref = ref
+        for fragment in self.fragments:
+            fragment.rebind(ref)                # <- The refresh also updates the mixed values markers
+
+    def relabel(self, fragment: engine.Fragment) -> None:
+        """ Update the fragment's label if its mixed values marker changed """
+        if fragment.label_element:
+            mixed = fragment.mixed
+            label, annotation = label_text(fragment)
+            if fragment.mixed != mixed:
+                cmds.text(fragment.label_element, edit=True, label=label, annotation=annotation)
+
+    def search(self, query: str) -> int:
+        """ Show only the fields whose name, label or group match the query, and the groups holding any of them, the existing rows and frames
+            are shown or hidden in place, so a search only edits the ones whose visibility changes, returns the number of edits made """
+        if query == self.query:
+            return 0
+        self.query = query
+        matches = self.index.match(query)
+        hidden = set() if matches is None else set(range(len(self._rows))).difference(matches)
+        changed, self.hidden = hidden.symmetric_difference(self.hidden), hidden
+
+        edits = 0
+        counts = self._hidden_counts
+        for position in changed:
+            fragment = self._rows[position]
+            counts[self._groups[position]] += 1 if position in hidden else -1
+            if fragment.row_element is not None:    # <- Not built yet, a lazy group hides its rows once built
+                cmds.layout(fragment.row_element, edit=True, visible=position not in hidden)
+                edits += 1
+
+        for group_name in {self._groups[position] for position in changed}:    # <- Only the groups whose rows changed may have to change
+            frame_element = self.frames.get(group_name)
+            if frame_element is not None:
+                visible = counts[group_name] < len(self.fragment_groups[group_name])
+                if visible == (group_name in self.hidden_groups):
+                    cmds.layout(frame_element, edit=True, visible=visible)
+                    if visible:
+                        self.hidden_groups.discard(group_name)
+                    else:
+                        self.hidden_groups.add(group_name)
+                    edits += 1
+        return edits
+
+    def _hide_built(self, fragments: list) -> None:
+        """ Hide the rows of a lazy group's fragments, built after the search that hid them """
+        if self.hidden:
+            positions = {fragment: position for position, fragment in enumerate(self._rows)}
+            for fragment in fragments:
+                if positions[fragment] in self.hidden:
+                    cmds.layout(fragment.row_element, edit=True, visible=False)
+
+    def clear(self) -> None:
+        """ Delete every control inside this panel """
+        children = cmds.columnLayout(self, query=True, childArray=True)
+        if children:
+            cmds.deleteUI(children)
+        self._drop_fragments()
+
+    def release(self) -> None:
+        """ Forget everything the panel holds, its callbacks, fragments and inspected object, it runs once the panel's ui is deleted """
+        self._drop_fragments()
+        self.ref = None
+        panels.pop(self, None)
+
+    def _drop_fragments(self) -> None:
+        for fragment in self.fragments:
+            if fragment.observed:
+                fragment.unobserve()
+            fragment.controls = None            # <- Released, the refreshes still queued for the idle cycle skip it
+        engine.ObservableField._dirty.difference_update(self.fragments)
+        lifecycle.release(self)
+        self.fragment_groups, self._rows = {}, []
+
+
+panels = globals().get("panels", {})
+""" Every panel created, by root element, it survives this module's reloads """
+
+
+def populate_panel(root_element: str, fragment_groups: dict[str, list], label_size: int, lazy=False, collapsed=False, on_built=None) -> dict[str, str]:
+    """ Build the frame layouts and widgets of every fragment group inside the panel's root element, returns the frame layouts by group name \n
+        on_built: called with the fragments of a lazy group, once its first expansion built them
+    """
+    cmds.setParent(root_element)
+    frames = {}
+
+    # Build frame layouts for each category
+    for group_name, fragments in fragment_groups.items():
         if group_name:
-            cmds.frameLayout(l=group_name, cll=True, fn="boldLabelFont")
-            cmds.columnLayout(columnAttach=('both', 0), adjustableColumn=True)
+            frame_element = frames[group_name] = cmds.frameLayout(l=group_name, cll=True, cl=lazy or collapsed, fn="boldLabelFont")
+            group_element = cmds.columnLayout(columnAttach=('both', 0), adjustableColumn=True)
+
+            if lazy:
+                def on_expand(*_, group_element=group_element, pending=list(fragments)):
+                    if pending:                                 # <- Only the first expansion builds the group
+                        build_group(group_element, pending, label_size)
+                        cmds.separator(style="in", h=3)
+                        if on_built is not None:
+                            on_built(list(pending))
+                        pending.clear()
+                cmds.frameLayout(frame_element, edit=True, expandCommand=on_expand)
+                cmds.setParent("..")
+                cmds.setParent("..")
+                continue
 
         # For each metadata fragment, build a widget for it
         for fragment in fragments:
-            if fragment.data.__label__:
-                if fragment.data.__label_style__ == engine.LabelStyle.Left:
-                    cmds.rowLayout(numberOfColumns=2, adjustableColumn2=2, columnWidth2=(label_size, 70), columnAlign2=["right", "left"], columnAttach2=["both", "right"])
-                    cmds.text(label=f"{fragment.data.__label__.title()}:", align="right", font="boldLabelFont")
-                    fragment.build_widget()
-                    cmds.setParent("..")
-
-                elif fragment.data.__label_style__ == engine.LabelStyle.Top:
-                    cmds.columnLayout(adj=True)
-                    cmds.text(label=f"{fragment.data.__label__.title()}:", align="left", font="boldLabelFont")
-                    fragment.build_widget()
-                    cmds.setParent("..")
-            elif not fragment.data.__label__ or fragment.data.__label_style__ == engine.LabelStyle.Off:
-                fragment.build_widget()
+            build_fragment(fragment, label_size)
 
         cmds.separator(style="in", h=3)
 
@@ -36,4 +249,270 @@ def create_panel(ref, label_size, *args, **kwargs) -> str:
             cmds.setParent("..")
 
     cmds.setParent("..")
-    return root_element
+    return frames
+
+
+_builders = WeakKeyDictionary()
+""" Compiled panel builders, by schema """
+
+
+def compile_builder(schema: engine.Schema):
+    """ Generate a function building the schema's panel contents, the same way populate_panel does but with every branch resolved,
+        and every label, group name and layout flag inlined as a constant, similar to how dataclasses generate their __init__ """
+    lines = ["def build(root_element, fragment_groups, label_size, collapsed, multi):",
+             "    frameLayout, columnLayout, rowLayout, text, separator, setParent = cmds.frameLayout, cmds.columnLayout, cmds.rowLayout, cmds.text, cmds.separator, cmds.setParent",
+             "    frames = {}",
+             "    setParent(root_element)"]
+
+    for group_name, entries in schema.groups.items():
+        lines.append(f"    fragments = fragment_groups[{group_name!r}]")
+        if group_name:
+            lines.append(f"    frames[{group_name!r}] = frameLayout(l={group_name!r}, cll=True, cl=collapsed, fn='boldLabelFont')")
+            lines.append("    columnLayout(columnAttach=('both', 0), adjustableColumn=True)")
+
+        for index, (_, data, _) in enumerate(entries):
+            lines.append(f"    fragment = fragments[{index}]")
+            if data.__label__ and data.__label_style__ in (engine.LabelStyle.Left, engine.LabelStyle.Top):
+                label = f"{data.__label__.title()}:"
+                lines.append(f"    label, annotation = label_text(fragment) if multi else ({label!r}, '')")
+                if data.__label_style__ == engine.LabelStyle.Left:
+                    lines.append("    fragment.row_element = rowLayout(numberOfColumns=2, adjustableColumn2=2, columnWidth2=(label_size, 70), columnAlign2=['right', 'left'], columnAttach2=['both', 'right'])")
+                    lines.append("    fragment.label_element = text(label=label, annotation=annotation, align='right', font='boldLabelFont')")
+                else:
+                    lines.append("    fragment.row_element = columnLayout(adj=True)")
+                    lines.append("    fragment.label_element = text(label=label, annotation=annotation, align='left', font='boldLabelFont')")
+                lines.append("    fragment.build_widget()")
+                lines.append("    setParent('..')")
+            elif not data.__label__ or data.__label_style__ == engine.LabelStyle.Off:
+                lines.append("    fragment.row_element = columnLayout(adj=True)")
+                lines.append("    fragment.build_widget()")
+                lines.append("    setParent('..')")
+
+        lines.append("    separator(style='in', h=3)")
+        if group_name:
+            lines.append("    setParent('..')")
+            lines.append("    setParent('..')")
+    lines.append("    setParent('..')")
+    lines.append("    return frames")
+
+    source = "\n".join(lines)
+    namespace = {"cmds": cmds, "label_text": label_text}
+    exec(source, namespace)
+    build = namespace["build"]
+    build.__source__ = source
+    return build
+
+
+_field_indexes = WeakKeyDictionary()
+""" Field indexes, by schema """
+
+
+def field_index(schema: engine.Schema) -> FieldIndex:
+    """ Get the index of the schema's field names, labels and groups, built on first use, its rows are the fields in display order """
+    index = _field_indexes.get(schema)
+    if index is None:
+        index = _field_indexes[schema] = FieldIndex((field_name, data.__label__, group_name)
+                                                    for group_name, entries in schema.groups.items() for field_name, data, _ in entries)
+    return index
+
+
+def builder(schema: engine.Schema):
+    """ Get the schema's compiled panel builder, compiling it on first use """
+    build = _builders.get(schema)
+    if build is None:
+        build = _builders[schema] = compile_builder(schema)
+    return build
+
+
+def create_panel(ref, label_size, *args, lazy=False, collapsed=False, observe=False, compiled=False, searchable=False, **kwargs) -> Panel:
+    """ Command that creates a tuning panel widget, ref can be a single object or a collection of objects of the same class \n
+        lazy: only build the group headers, each group's widgets are built the first time it gets expanded, groups start collapsed \n
+        collapsed: start every group collapsed \n
+        observe: turn the inspected fields into observable fields, so writes made by anyone refresh the panel once per idle cycle \n
+        compiled: build through a function generated once per class, instead of interpreting the reflection on every build \n
+        searchable: add a search box filtering the fields in place, see Panel.search
+    """
+    if isinstance(ref, (list, tuple, set, frozenset)):     # <- Many targets share one set of widgets, edits are batched to all of them
+        ref = engine.MultiTarget(ref)
+
+    panel = Panel(cmds.columnLayout(*args, **kwargs), ref, label_size, lazy, collapsed, observe, compiled, searchable)
+    panel.populate(engine.Schema.of(engine.inspected_class(ref)))
+
+    panels[panel] = panel
+    cmds.scriptJob(uiDeleted=[panel, panel.release], runOnce=True)     # <- However the panel goes, such as its window being closed, let go of it
+    return panel
+
+
+def refresh_panels() -> list[Panel]:
+    """ Rebuild, in place, the open panels whose inspected class's schema changed since they were built, such as after a hot reload,
+        returns the rebuilt panels """
+    rebuilt = []
+    for panel in list(panels.values()):
+        if not cmds.columnLayout(panel, exists=True):     # <- The panel is gone, forget it
+            del panels[panel]
+            continue
+
+        schema = engine.Schema.of(engine.latest_class(engine.inspected_class(panel.ref)))   # <- The target may still be an instance of the class before the reload
+        if schema.signature == panel.signature:
+            continue
+
+        panel.clear()
+        panel.populate(schema)
+        rebuilt.append(panel)
+    return rebuilt
+
+
+class PanelPool:
+    """ This class keeps a few ready, hidden, panels per inspected class under a parent layout,
+        showing an object reuses a panel of its class by rebinding it, so switching targets costs O(fields) edits instead of a rebuild """
+
+    def __init__(self, parent: str, label_size: int, size: int = 4, **options) -> None:
+        self.parent: str = parent
+        """ The layout holding the pooled panels """
+
+        self.label_size: int = label_size
+        self.size: int = size
+        """ Maximum number of hidden panels kept, the least recently used ones are deleted past it """
+
+        self.options: dict = options
+        """ Options given to create_panel, such as lazy, observe or the column layout flags """
+
+        self.current: Panel = None
+        """ The panel currently shown """
+
+        self.hidden: list[Panel] = []
+        """ The hidden panels, least recently used first """
+
+        self.stats: dict[str, int] = {"built": 0, "rebound": 0, "evicted": 0}
+        """ Number of panels built, rebound and deleted by this pool """
+
+    def show(self, ref) -> Panel:
+        """ Show a panel inspecting ref, reusing a hidden panel of the same class if there is one """
+        if self.current is not None:
+            self.release(self.current)
+
+        signature = engine.Schema.of(engine.inspected_class(engine.MultiTarget(ref) if isinstance(ref, (list, tuple, set, frozenset)) else ref)).signature
+        panel = next((panel for panel in reversed(self.hidden) if panel.signature == signature), None)
+        if panel is not None:
+            self.hidden.remove(panel)
+            panel.rebind(ref)
+            cmds.columnLayout(panel, edit=True, visible=True)
+            self.stats["rebound"] += 1
+        else:
+            cmds.setParent(self.parent)
+            panel = create_panel(ref, self.label_size, **self.options)
+            self.stats["built"] += 1
+
+        self.current = panel
+        return panel
+
+    def release(self, panel: Panel) -> None:
+        """ Hide the panel and keep it ready for the next object of its class """
+        cmds.columnLayout(panel, edit=True, visible=False)
+        if panel is self.current:
+            self.current = None
+        self.hidden.append(panel)
+        while len(self.hidden) > self.size:         # <- Evict the least recently used panel
+            evicted = self.hidden.pop(0)
+            cmds.deleteUI(evicted)
+            panels.pop(evicted, None)
+            self.stats["evicted"] += 1
+
+    def clear(self) -> None:
+        """ Delete every panel of the pool """
+        for panel in self.hidden + ([self.current] if self.current is not None else []):
+            if cmds.columnLayout(panel, exists=True):
+                cmds.deleteUI(panel)
+            panels.pop(panel, None)
+        self.hidden, self.current = [], None
+
+
+class AutoInspector:
+    """ This class is a dock inspecting the object standing for the current maya selection, the selection events are debounced,
+        a settled selection resolving to the object already shown is skipped, and recently shown classes keep a ready panel in a pool """
+
+    def __init__(self, resolve, label_size: int = 75, delay: float = 0.1, size: int = 4, name: str = "MetaWindowAutoInspector", **options) -> None:
+        self.resolve = resolve
+        """ Function receiving the selected node names, returning the object to inspect, a collection of objects of the same class, or None """
+
+        self.label_size: int = label_size
+        self.name: str = name
+        """ The dock's workspace control name """
+
+        self.size: int = size
+        """ Maximum number of hidden panels kept ready """
+
+        self.options: dict = options
+        """ Options given to create_panel, such as lazy, observe or compiled """
+
+        self.debouncer = Debouncer(self.update, delay)
+        """ Collapses the selection events of a burst, such as a marquee drag, into a single update """
+
+        self.pool: PanelPool = None
+        """ Panels of the recently inspected classes """
+
+        self.selection: list[str] = None
+        """ The selection last resolved """
+
+        self.target = None
+        """ The object last shown, None if nothing is shown """
+
+        self.stats: dict[str, int] = {"events": 0, "updates": 0, "skipped": 0}
+        """ Number of selection events received, updates run once they settled, and updates skipped since nothing changed """
+
+        self._job = None
+
+    def open(self) -> str:
+        """ Create the dock, replacing any previous one, and start following the selection """
+        if cmds.workspaceControl(self.name, exists=True):
+            cmds.deleteUI(self.name)
+        cmds.workspaceControl(self.name, label="Inspector", retain=False, floating=True)
+        layout_element = cmds.columnLayout(adjustableColumn=True)
+        self.pool = PanelPool(layout_element, self.label_size, self.size, **self.options)
+        self.selection = self.target = None
+        self._job = cmds.scriptJob(event=["SelectionChanged", self.on_selection_changed], parent=self.name)     # <- Killed along with the dock
+        self.update()
+        return self.name
+
+    def close(self) -> None:
+        """ Stop following the selection and delete the dock """
+        self.debouncer.cancel()
+        if self._job is not None and cmds.scriptJob(exists=self._job):
+            cmds.scriptJob(kill=self._job)
+        self._job = None
+        if self.pool is not None:
+            self.pool.clear()
+        if cmds.workspaceControl(self.name, exists=True):
+            cmds.deleteUI(self.name)
+
+    def on_selection_changed(self, *_) -> None:
+        self.stats["events"] += 1
+        self.debouncer.push()
+
+    def update(self, *_) -> None:
+        """ Show the object standing for the current selection, unless it is already shown """
+        selection = cmds.ls(selection=True, long=True) or []
+        if selection == self.selection:         # <- Selected and deselected within the burst
+            self.stats["skipped"] += 1
+            return
+        self.selection = selection
+
+        target = self.resolve(selection) if selection else None
+        if isinstance(target, (list, tuple, set, frozenset)):
+            target = tuple(target) if target else None
+        if target is self.target or (isinstance(target, tuple) and isinstance(self.target, tuple) and len(target) == len(self.target)
+                                     and all(a is b for a, b in zip(target, self.target))):
+            self.stats["skipped"] += 1          # <- Another node standing for the same object
+            return
+
+        self.stats["updates"] += 1
+        self.target = target
+        if target is None:
+            if self.pool.current is not None:
+                self.pool.release(self.pool.current)
+        else:
+            self.pool.show(list(target) if isinstance(target, tuple) else target)
+
+    def metrics(self) -> dict[str, int]:
+        """ Events received, updates run and skipped, along with the panels built, rebound and evicted by the pool """
+        return {**self.stats, **(self.pool.stats if self.pool is not None else {})}
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+import profiler
+
+current = None
+""" The owner of the callbacks installed right now, such as the panel being built, None outside of any """
+
+
+class Callback:
+    """ This class is the handle maya receives in place of a widget's callback, the owner keeps every handle it was given,
+        releasing the owner drops the callbacks along with everything they hold, even if maya keeps the handles around """
+
+    __slots__ = "function", "owner", "__weakref__"
+
+    def __init__(self, function, owner) -> None:
+        self.function = function
+        self.owner = owner
+
+    def __call__(self, *args, **kwargs):
+        function = self.function
+        if function is None:                    # <- Released, its controls are on their way out
+            return None
+        global current
+        previous, current = current, self.owner    # <- Controls created by the callback belong to the same owner
+        try:
+            return function(*args, **kwargs)
+        finally:
+            current = previous
+
+
+@contextmanager
+def owned_by(owner):
+    """ Register the callbacks installed within the block with the owner, an object holding a callbacks list """
+    global current
+    previous, current = current, owner
+    try:
+        yield owner
+    finally:
+        current = previous
+
+
+def track(command: str, function):
+    """ Wrap a cmds command, so the callbacks given to it are registered with the current owner """
+    def tracked(*args, **flags):
+        owner = current
+        if owner is not None:
+            for flag, value in flags.items():
+                if flag in profiler.CALLBACK_FLAGS and callable(value) and not isinstance(value, Callback):
+                    flags[flag] = handle = Callback(value, owner)
+                    owner.callbacks.append(handle)
+        return function(*args, **flags)
+    return tracked
+
+
+def owned(function):
+    """ Register the function with the current owner, for functions called later on than by a control, such as from the idle queue,
+        the returned handle does nothing once the owner is released, the function itself is returned outside of any owner """
+    owner = current
+    if owner is None:
+        return function
+    handle = Callback(function, owner)
+    owner.callbacks.append(handle)
+    return handle
+
+
+def release(owner) -> int:
+    """ Drop every callback registered with the owner, returns how many were dropped """
+    released = len(owner.callbacks)
+    for handle in owner.callbacks:
+        handle.function = handle.owner = None
+    owner.callbacks.clear()
+    return released
@@ -0,0 +1,152 @@
+# Headless stand-in for the part of maya.api.OpenMaya used to bind plugs, it is imported in its place when running outside maya
+
+
+scene: dict = globals().get("scene", {})
+""" Every node of the stand-in scene, by name """
+
+
+class MObject:
+    """ Stand-in for a dependency node, it holds its attribute values by name, compound attributes hold a list of child values """
+
+    __slots__ = "name", "values"
+
+    def __init__(self, name: str, values: dict) -> None:
+        self.name = name
+        self.values = values
+
+
+def create_node(name: str, **attributes) -> MObject:
+    """ Add a node to the stand-in scene, a list or tuple value makes a compound attribute of doubles, this function only exists in the stand-in """
+    node = scene[name] = MObject(name, {attribute: list(map(float, value)) if isinstance(value, (list, tuple)) else value
+                                        for attribute, value in attributes.items()})
+    return node
+
+
+class MSelectionList:
+    """ Stand-in for MSelectionList, it only holds dependency nodes """
+
+    def __init__(self) -> None:
+        self._nodes = []
+
+    def add(self, name: str) -> "MSelectionList":
+        node = scene.get(name)
+        if node is None:
+            raise RuntimeError("(kInvalidParameter): Object does not exist")
+        self._nodes.append(node)
+        return self
+
+    def length(self) -> int:
+        return len(self._nodes)
+
+    def getDependNode(self, index: int) -> MObject:
+        return self._nodes[index]
+
+
+class MFnDependencyNode:
+    """ Stand-in for MFnDependencyNode """
+
+    def __init__(self, node: MObject) -> None:
+        self._node = node
+
+    def name(self) -> str:
+        return self._node.name
+
+    def findPlug(self, attribute: str, want_networked_plug: bool) -> "MPlug":
+        if attribute not in self._node.values:
+            raise RuntimeError("(kInvalidParameter): No element at given index")
+        return MPlug(self._node, attribute)
+
+
+class MPlug:
+    """ Stand-in for MPlug, a node's attribute, or one child of a compound attribute """
+
+    __slots__ = "_node", "_attribute", "_index"
+
+    def __init__(self, node: MObject, attribute: str, index: int = None) -> None:
+        self._node = node
+        self._attribute = attribute
+        self._index = index
+
+    @property
+    def isCompound(self) -> bool:
+        return self._index is None and isinstance(self._node.values[self._attribute], list)
+
+    def numChildren(self) -> int:
+        return len(self._node.values[self._attribute])
+
+    def child(self, index: int) -> "MPlug":
+        return MPlug(self._node, self._attribute, index)
+
+    def node(self) -> MObject:
+        return self._node
+
+    def name(self) -> str:
+        return f"{self._node.name}.{self._attribute}" + ("" if self._index is None else "XYZ"[self._index])
+
+    def _get(self):
+        value = self._node.values[self._attribute]
+        return value if self._index is None else value[self._index]
+
+    def _set(self, value) -> None:
+        if self._index is None:
+            self._node.values[self._attribute] = value
+        else:
+            self._node.values[self._attribute][self._index] = value
+
+    def asDouble(self) -> float:
+        return float(self._get())
+
+    def asInt(self) -> int:
+        return int(self._get())
+
+    def asBool(self) -> bool:
+        return bool(self._get())
+
+    def asString(self) -> str:
+        return str(self._get())
+
+
+class MDGModifier:
+    """ Stand-in for MDGModifier, the new plug values are only applied by doIt, and undoIt puts the previous ones back,
+        its class counters only exist in the stand-in, they count what went through every modifier """
+
+    calls = 0
+    """ Number of doIt calls """
+
+    plugs_written = 0
+    """ Number of plug values applied by doIt """
+
+    def __init__(self) -> None:
+        self._edits = []
+        self._undo = []
+
+    def _queue(self, plug: MPlug, value) -> "MDGModifier":
+        self._edits.append((plug, value))
+        return self
+
+    def newPlugValueDouble(self, plug: MPlug, value: float) -> "MDGModifier":
+        return self._queue(plug, float(value))
+
+    def newPlugValueInt(self, plug: MPlug, value: int) -> "MDGModifier":
+        return self._queue(plug, int(value))
+
+    def newPlugValueBool(self, plug: MPlug, value: bool) -> "MDGModifier":
+        return self._queue(plug, bool(value))
+
+    def newPlugValueString(self, plug: MPlug, value: str) -> "MDGModifier":
+        return self._queue(plug, str(value))
+
+    def doIt(self) -> "MDGModifier":
+        self._undo.clear()
+        MDGModifier.calls += 1
+        MDGModifier.plugs_written += len(self._edits)
+        for plug, value in self._edits:
+            self._undo.append((plug, plug._get()))
+            plug._set(value)
+        return self
+
+    def undoIt(self) -> "MDGModifier":
+        for plug, value in reversed(self._undo):
+            plug._set(value)
+        self._undo.clear()
+        return self
@@ -0,0 +1,131 @@
+from backend import MVector, defer
+import engine
+
+try:
+    from maya.api import OpenMaya as om
+except ImportError:     # <- Running outside maya, plugs live in the headless stand-in
+    import openmaya as om
+
+
+def _read_vector(plug) -> MVector:
+    return MVector(plug.child(0).asDouble(), plug.child(1).asDouble(), plug.child(2).asDouble())
+
+
+def _write_vector(modifier, plug, vector) -> None:
+    for index in range(3):
+        modifier.newPlugValueDouble(plug.child(index), vector[index])
+
+
+ACCESSORS = {
+    bool: (lambda plug: plug.asBool(), lambda modifier, plug, value: modifier.newPlugValueBool(plug, value)),
+    int: (lambda plug: plug.asInt(), lambda modifier, plug, value: modifier.newPlugValueInt(plug, value)),
+    float: (lambda plug: plug.asDouble(), lambda modifier, plug, value: modifier.newPlugValueDouble(plug, value)),
+    str: (lambda plug: plug.asString(), lambda modifier, plug, value: modifier.newPlugValueString(plug, value)),
+    MVector: (_read_vector, _write_vector),
+}
+""" Functions reading a plug, and queueing a plug write into a modifier, by widget type """
+
+
+_EMPTY = object()
+
+
+class WriteQueue:
+    """ This class holds the plug writes waiting for the next idle cycle, they are flushed through a single MDGModifier,
+        so an edit burst spanning many fields and many nodes costs one modifier call, a plug written twice only keeps its newest value """
+
+    def __init__(self) -> None:
+        self.pending: dict[tuple[str, str], tuple] = {}
+        """ The (plug, write function, value) waiting for each (node, attribute) """
+
+        self.last = None
+        """ The last modifier flushed, its undoIt reverts that flush """
+
+        self.flushes: int = 0
+        """ Number of modifier calls made """
+
+        self.written: int = 0
+        """ Number of plug values flushed """
+
+        self.superseded: int = 0
+        """ Number of values dropped, replaced by a newer one before they were flushed """
+
+    def queue(self, key: tuple[str, str], plug, write, value) -> None:
+        """ Queue a plug write, the first one since the last flush schedules the next one """
+        if not self.pending:
+            defer(self.flush)
+        elif key in self.pending:
+            self.superseded += 1
+        self.pending[key] = plug, write, value
+
+    def get(self, key: tuple[str, str], default=_EMPTY):
+        """ The value waiting for the plug, default when there is none """
+        entry = self.pending.get(key)
+        return default if entry is None else entry[2]
+
+    def flush(self) -> int:
+        """ Write every pending value through one modifier, returns how many were written """
+        pending, self.pending = self.pending, {}
+        if not pending:                         # <- Already flushed by hand
+            return 0
+        modifier = om.MDGModifier()
+        for plug, write, value in pending.values():
+            write(modifier, plug, value)
+        modifier.doIt()
+        self.last = modifier
+        self.flushes += 1
+        self.written += len(pending)
+        return len(pending)
+
+
+writes = globals().get("writes") or WriteQueue()
+""" The plug writes of every node target, it survives this module's reloads so no write is lost """
+
+
+class NodeTarget:
+    """ This class is a bind target over the attributes of one or many maya nodes, the inspected class describes them,
+        each annotated field stands for the node attribute of the same name, reads come from the first node and writes go to every node,
+        writes are queued and flushed through one MDGModifier on the next idle cycle, reads see the queued values """
+
+    def __init__(self, cls: type, nodes) -> None:
+        nodes = (nodes,) if isinstance(nodes, str) else tuple(nodes)
+        if not nodes:
+            raise ValueError("NodeTarget needs at least one node")
+        accessors = {}
+        for entries in engine.Schema.of(cls).groups.values():
+            for field_name, data, _ in entries:
+                if data.__type__ not in ACCESSORS:
+                    raise TypeError(f"{cls.__name__}.{field_name} is a {type(data).__name__}, its values can't be stored in a plug")
+                accessors[field_name] = ACCESSORS[data.__type__]
+
+        object.__setattr__(self, "nodes", nodes)
+        object.__setattr__(self, "_cls", cls)
+        object.__setattr__(self, "_accessors", accessors)
+        object.__setattr__(self, "_plugs", {})
+        object.__setattr__(self, "_functions", None)
+
+    @property
+    def __inspected_class__(self) -> type:
+        return self._cls
+
+    def plugs(self, field_name: str) -> list:
+        """ The field's plug on every node, they are looked up once """
+        plugs = self._plugs.get(field_name)
+        if plugs is None:
+            if self._functions is None:         # <- The nodes are looked up by name once, on first access
+                object.__setattr__(self, "_functions", [om.MFnDependencyNode(om.MSelectionList().add(node).getDependNode(0)) for node in self.nodes])
+            plugs = self._plugs[field_name] = [function.findPlug(field_name, False) for function in self._functions]
+        return plugs
+
+    def __getattr__(self, name):
+        accessors = self.__dict__["_accessors"]
+        if name not in accessors:
+            raise AttributeError(f"{self._cls.__name__} has no {name} field")
+        value = writes.get((self.nodes[0], name))
+        return accessors[name][0](self.plugs(name)[0]) if value is _EMPTY else value      # <- A queued value is what the node will hold
+
+    def __setattr__(self, name, value) -> None:
+        if name not in self._accessors:
+            raise AttributeError(f"{self._cls.__name__} has no {name} field")
+        write = self._accessors[name][1]
+        for node, plug in zip(self.nodes, self.plugs(name)):
+            writes.queue((node, name), plug, write, value)
@@ -0,0 +1,201 @@
+import json
+from array import array
+from collections import deque
+from itertools import islice, repeat
+from operator import attrgetter
+from typing import get_origin
+from weakref import WeakKeyDictionary
+import engine
+from arrays import flat_view
+from backend import MVector
+
+FORMAT = "MetaWindow"
+""" Name written in every stream's header """
+
+VERSION = 1
+""" Version of the format written, streams of a newer version are refused """
+
+CHUNK = 1024
+""" Rows written per line, a line is a json array of rows, so the json encoder runs once per chunk rather than once per object """
+
+_encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
+
+
+def encoder_of(T):
+    """ Function turning a value of the widget type T into a json value, None if the value already is one """
+    origin = get_origin(T) or T
+    if origin in (set, frozenset):
+        return sorted
+    if origin is dict:
+        return dict                         # <- A copy, so later edits of the object never reach the snapshot
+    if T is MVector:
+        return lambda vector: [vector[0], vector[1], vector[2]]
+    if T is array:
+        return _encode_buffer
+    return None
+
+
+def _encode_buffer(buffer) -> list:
+    view = flat_view(buffer)
+    return [view.format, view.tolist()]
+
+
+def decoder_of(T):
+    """ Function turning a json value back into a value of the widget type T, None if the json value is already one """
+    origin = get_origin(T) or T
+    if origin in (set, frozenset):
+        return origin
+    if origin is dict:
+        return dict
+    if T is MVector:
+        return lambda items: MVector(*items)
+    if T is array:
+        return lambda items: array(*items)
+    return None
+
+
+class Layout:
+    """ This class is the snapshot layout of an inspected class, built once per schema, it knows the field order
+        and how each field's value is encoded to, and decoded from, json values """
+
+    _cache = WeakKeyDictionary()
+    """ Layouts, by schema """
+
+    def __init__(self, schema: engine.Schema) -> None:
+        types = {field_name: data.__type__ for entries in schema.groups.values() for field_name, data, _ in entries}
+
+        self.fields: tuple[str, ...] = schema.fields
+        """ Every snapshot field, in row order """
+
+        self.encoders: tuple = tuple(encoder_of(types[field_name]) for field_name in self.fields)
+        self.decoders: dict = {field_name: decoder_of(types[field_name]) for field_name in self.fields}
+        self._row_decoders: tuple = tuple(self.decoders.values())
+        if len(self.fields) > 1:
+            self._read = attrgetter(*self.fields)
+        elif self.fields:                       # <- attrgetter returns a lone value rather than a tuple for one field
+            self._read = lambda target: (getattr(target, self.fields[0]),)
+        else:
+            self._read = lambda target: ()
+
+    @staticmethod
+    def of(cls: type) -> "Layout":
+        """ Get the layout of the class's current schema """
+        schema = engine.Schema.of(cls)
+        layout = Layout._cache.get(schema)
+        if layout is None:
+            layout = Layout._cache[schema] = Layout(schema)
+        return layout
+
+    def encode(self, target) -> list:
+        """ Capture the target's fields as a row of json values, in field order """
+        return [value if encode is None else encode(value) for value, encode in zip(self._read(target), self.encoders)]
+
+    def encode_rows(self, targets: list) -> list:
+        """ Capture many targets as rows of json values, the values are encoded a field at a time, so each encoder is mapped over a whole column """
+        columns = list(zip(*map(self._read, targets)))
+        if not columns:
+            return [()] * len(targets)
+        for position, encode in enumerate(self.encoders):
+            if encode is not None:
+                columns[position] = list(map(encode, columns[position]))
+        return list(zip(*columns))          # <- Tuples, the json encoder writes them as arrays
+
+    def decode_row(self, row: list) -> list:
+        """ Turn a row of json values, in field order, back into field values """
+        return [value if decode is None else decode(value) for value, decode in zip(row, self._row_decoders)]
+
+    def decode(self, values: dict) -> dict:
+        """ Turn captured json values back into field values, the fields this class doesn't have are left out """
+        decoders = self.decoders
+        return {field_name: value if decoders[field_name] is None else decoders[field_name](value)
+                for field_name, value in values.items() if field_name in decoders}
+
+
+def capture(target) -> dict:
+    """ Capture every annotated field of the target, as json values by field name, it can be restored to, or applied on, any object of the same class """
+    layout = Layout.of(engine.inspected_class(target))
+    return dict(zip(layout.fields, layout.encode(target)))
+
+
+def restore(target, values: dict) -> None:
+    """ Write captured values back into the target """
+    for field_name, value in Layout.of(engine.inspected_class(target)).decode(values).items():
+        setattr(target, field_name, value)
+
+
+def apply(values: dict, targets) -> None:
+    """ Write one preset to many objects of the same class, the values are decoded once and each field is written to every target in one batched pass """
+    targets = targets if isinstance(targets, (list, tuple)) else list(targets)
+    if targets:
+        for field_name, value in Layout.of(engine.inspected_class(targets[0])).decode(values).items():
+            engine.batch_set(targets, field_name, value)
+
+
+def dump(targets, stream) -> int:
+    """ Stream snapshots of objects of the same class to a text stream, a json header line followed by lines of up to CHUNK json rows,
+        a row holds an object's json values in the header's field order, targets can be any iterable, such as a generator,
+        returns the number of rows written """
+    targets = iter(targets)
+    chunk = list(islice(targets, CHUNK))
+    if not chunk:
+        return 0
+    cls = engine.inspected_class(chunk[0])
+    layout = Layout.of(cls)
+    stream.write(_encoder.encode({"format": FORMAT, "version": VERSION, "class": f"{cls.__module__}.{cls.__qualname__}", "fields": layout.fields}))
+    stream.write("\n")
+
+    rows = 0
+    while chunk:
+        stream.write(_encoder.encode(layout.encode_rows(chunk)))
+        stream.write("\n")
+        rows += len(chunk)
+        chunk = list(islice(targets, CHUNK))
+    return rows
+
+
+def _chunks(stream):
+    """ Read a stream's header, then its rows a line at a time, yields the header's field names first, then a list of rows per line """
+    line = stream.readline()
+    header = json.loads(line) if line.strip() else None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("Not a MetaWindow snapshot stream")
+    if header["version"] > VERSION:
+        raise ValueError(f"Snapshot stream version {header['version']} is newer than the supported version {VERSION}")
+    yield tuple(header["fields"])
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def load(stream):
+    """ Read the snapshots of a stream written by dump, one at a time, as json values by field name """
+    chunks = _chunks(stream)
+    fields = next(chunks)
+    for rows in chunks:
+        for row in rows:
+            yield dict(zip(fields, row))
+
+
+def restore_all(targets, stream) -> int:
+    """ Restore a stream written by dump into the targets, in order, returns the number of objects restored,
+        rows written from the same schema are restored a line at a time, each field being decoded and written to the line's targets in one pass """
+    targets = iter(targets)
+    chunks = _chunks(stream)
+    fields = next(chunks)
+    restored = 0
+    layout = None
+    for rows in chunks:
+        chunk = list(islice(targets, len(rows)))
+        if not chunk:
+            break
+        if layout is None:                  # <- The objects share a class, its layout is looked up once
+            layout = Layout.of(engine.inspected_class(chunk[0]))
+        if fields == layout.fields:         # <- Written from the same schema, the rows are already in field order
+            for field_name, decode, column in zip(fields, layout._row_decoders, zip(*rows[:len(chunk)])):
+                deque(map(setattr, chunk, repeat(field_name), column if decode is None else map(decode, column)), maxlen=0)
+        else:
+            for target, row in zip(chunk, rows):
+                for field_name, value in layout.decode(dict(zip(fields, row))).items():
+                    setattr(target, field_name, value)
+        restored += len(chunk)
+    return restored
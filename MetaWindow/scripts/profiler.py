@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+enabled = False
+""" Whether profiling is on, while it is off the instrumented code paths only pay for checking this flag """
+
+CALLBACK_FLAGS = frozenset(("cc", "changeCommand", "dc", "dragCommand", "tcc", "textChangedCommand", "ec", "enterCommand", "command", "c",
+                            "deleteKeyCommand", "dkc", "expandCommand", "postMenuCommand", "pmc"))
+""" Cmds flags whose value is a callback installed by the widgets or the inspector """
+
+events: list[dict] = []
+""" Recorded spans, as chrome trace complete events """
+
+_state = threading.local()
+_origin = time.perf_counter()
+
+
+def enable(clear: bool = True) -> None:
+    """ Start profiling, builds and callbacks installed from now on are measured """
+    global enabled
+    if clear:
+        reset()
+    enabled = True
+
+
+def disable() -> None:
+    """ Stop profiling, the callbacks already instrumented keep reporting until their panel is rebuilt """
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """ Forget every recorded span """
+    events.clear()
+
+
+def _record(name: str, category: str, start: float, end: float, **args) -> None:
+    events.append({"name": name, "cat": category, "ph": "X", "ts": (start - _origin) * 1e6, "dur": (end - start) * 1e6,
+                   "pid": os.getpid(), "tid": threading.get_ident(), "args": args})
+
+
+def build(fragment, function):
+    """ Run the fragment's widget build function, recording its duration, callbacks installed meanwhile are attributed to the fragment's field """
+    field_name = fragment.bind.field_name
+    widget = type(fragment.data).__name__
+    previous, _state.field = getattr(_state, "field", None), field_name
+    start = time.perf_counter()
+    try:
+        return function()
+    finally:
+        _record(field_name, "build", start, time.perf_counter(), field=field_name, widget=widget)
+        _state.field = previous
+
+
+def write(bind, value) -> None:
+    """ Write the value through the bind, recording the setattr duration """
+    start = time.perf_counter()
+    try:
+        setattr(bind.target, bind.field_name, value)
+    finally:
+        end = time.perf_counter()
+        _record(bind.field_name, "write", start, end, field=bind.field_name)
+        _state.written = getattr(_state, "written", 0.0) + end - start     # <- Accumulated into the callback running this write, if any
+
+
+def instrument(command: str, function):
+    """ Wrap a cmds command, so the callbacks given to it are measured every time they fire """
+    def instrumented(*args, **flags):
+        field_name = getattr(_state, "field", None)
+        for flag, value in flags.items():
+            if flag in CALLBACK_FLAGS and callable(value):
+                flags[flag] = _callback(value, field_name, command, flag)
+        return function(*args, **flags)
+    return instrumented
+
+
+def _callback(function, field_name: str, command: str, flag: str):
+    def measured(*args, **kwargs):
+        previous, _state.written = getattr(_state, "written", 0.0), 0.0
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(f"{command}.{flag}", "callback", start, time.perf_counter(), field=field_name, command=command, flag=flag, setattr_us=_state.written * 1e6)
+            _state.written = previous + _state.written
+    return measured
+
+
+def summary() -> dict:
+    """ Aggregate the recorded spans, build time per field and per widget type, callback latency per field and callback, with the setattr time spent inside """
+    builds_by_field, builds_by_widget = defaultdict(lambda: [0, 0.0]), defaultdict(lambda: [0, 0.0])
+    callbacks = defaultdict(lambda: [0, 0.0, 0.0])
+
+    for event in events:
+        args = event["args"]
+        if event["cat"] == "build":
+            for table, key in ((builds_by_field, args["field"]), (builds_by_widget, args["widget"])):
+                table[key][0] += 1
+                table[key][1] += event["dur"]
+        elif event["cat"] == "callback":
+            entry = callbacks[f"{args['field']}:{event['name']}"]
+            entry[0] += 1
+            entry[1] += event["dur"]
+            entry[2] += args["setattr_us"]
+
+    def table(rows: dict, *columns: str) -> dict:
+        return {key: dict(zip(columns, values)) for key, values in sorted(rows.items(), key=lambda item: -item[1][1])}
+
+    return {"build_by_field": table(builds_by_field, "count", "total_us"),
+            "build_by_widget": table(builds_by_widget, "count", "total_us"),
+            "callbacks": table(callbacks, "count", "total_us", "setattr_us")}
+
+
+def export_json(path: str) -> None:
+    """ Write the summary to a json file """
+    with open(path, "w") as file:
+        json.dump(summary(), file, indent=2)
+
+
+def export_trace(path: str) -> None:
+    """ Write the recorded spans to a chrome trace event file, it can be opened with chrome://tracing or perfetto """
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,46 @@
+import time
+from functools import partial
+from backend import cmds
+
+
+class ChoiceMemo:
+    """ This class memoizes the results of choices providers, the functions widgets call to list their choices,
+        a result is computed again once its time to live elapses, once it is invalidated, or once one of its invalidation events fires """
+
+    def __init__(self) -> None:
+        self.results: dict = {}
+        """ Every memoized result, maps each provider to its (computation time, choices) """
+
+        self.jobs: dict = {}
+        """ Script jobs invalidating a provider, maps each (provider, event name) to its script job """
+
+        self.stats = {"calls": 0, "hits": 0}
+        """ Number of times the providers were run, and number of times a memoized result was used instead """
+
+    def get(self, provider, ttl: float = 0) -> list:
+        """ The provider's choices, memoized, a ttl of 0 keeps them until invalidated """
+        entry = self.results.get(provider)
+        now = time.monotonic()
+        if entry is None or (ttl and now - entry[0] > ttl):
+            self.stats["calls"] += 1
+            entry = self.results[provider] = now, list(provider())
+        else:
+            self.stats["hits"] += 1
+        return entry[1]
+
+    def invalidate(self, provider=None, *_) -> None:
+        """ Forget the provider's choices, or every provider's choices if none is given """
+        if provider is None:
+            self.results.clear()
+        else:
+            self.results.pop(provider, None)
+
+    def invalidate_on(self, provider, events) -> None:
+        """ Forget the provider's choices whenever one of the maya events fires, such as SceneOpened, the script jobs are only created once """
+        for event in events:
+            if (provider, event) not in self.jobs:
+                self.jobs[(provider, event)] = cmds.scriptJob(event=[event, partial(self.invalidate, provider)])
+
+
+memo = globals().get("memo") or ChoiceMemo()
+""" Memo shared by every dropdown, it survives hot reloads so its script jobs are never duplicated """
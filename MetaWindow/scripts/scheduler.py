@@ -0,0 +1,140 @@
+import threading
+import time
+from backend import defer
+
+
+class Throttle:
+    """ This class coalesces a burst of updates into at most max_rate applications per second, the newest value always wins,
+        values superseded before being applied are dropped """
+
+    applied_total = 0
+    """ Updates applied across every throttle """
+
+    dropped_total = 0
+    """ Updates dropped across every throttle """
+
+    def __init__(self, apply, max_rate: float) -> None:
+        self.apply = apply
+        """ Function that receives the values that make it through """
+
+        self.interval: float = 1.0 / max_rate if max_rate > 0 else 0.0
+        """ Minimum time between two applications, in seconds """
+
+        self.applied: int = 0
+        """ Updates applied by this throttle """
+
+        self.dropped: int = 0
+        """ Updates dropped by this throttle """
+
+        self._value = None
+        self._pending = False
+        self._generation = 0
+        self._last_apply = 0.0
+        self._timer = None
+
+    def push(self, value) -> None:
+        """ Queue a value, it will be applied once the interval elapses and maya is idle, unless a newer value replaces it first """
+        if self._pending:                           # <- A value is already waiting, it will never be seen
+            self._drop()
+        self._value = value
+
+        if not self._pending:
+            self._pending = True
+            delay = self._last_apply + self.interval - time.perf_counter()
+            if delay > 0:                           # <- Too soon, wait for the interval to elapse then wait for maya to be idle
+                self._timer = threading.Timer(delay, defer, (self._flush, self._generation))
+                self._timer.daemon = True
+                self._timer.start()
+            else:
+                defer(self._flush, self._generation)
+
+    def commit(self, value) -> None:
+        """ Apply a value right away, superseding any pending one, use it for the final value of a burst """
+        if self._pending:
+            self._drop()
+        self._cancel()
+        self._apply(value)
+
+    def _flush(self, generation: int) -> None:
+        if self._pending and generation == self._generation:     # <- Ignore flushes scheduled before a commit
+            self._pending = False
+            self._timer = None
+            self._apply(self._value)
+
+    def _apply(self, value) -> None:
+        self._last_apply = time.perf_counter()
+        self.applied += 1
+        Throttle.applied_total += 1
+        self.apply(value)
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        Throttle.dropped_total += 1
+
+    def _cancel(self) -> None:
+        self._pending = False
+        self._generation += 1
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+
+class Debouncer:
+    """ This class waits for a burst of updates to settle, the newest value is applied once no update came for delay seconds and maya is idle,
+        a single timer runs per burst, however many updates it holds """
+
+    def __init__(self, apply, delay: float) -> None:
+        self.apply = apply
+        """ Function that receives the value ending each burst """
+
+        self.delay: float = delay
+        """ Quiet time needed to end a burst, in seconds, 0 ends it on the next idle cycle """
+
+        self.pushed: int = 0
+        """ Updates received by this debouncer """
+
+        self.applied: int = 0
+        """ Updates applied by this debouncer """
+
+        self._value = None
+        self._waiting = False
+        self._deadline = 0.0
+        self._generation = 0
+        self._timer = None
+
+    def push(self, value=None) -> None:
+        """ Queue a value, it will be applied once the updates settle and maya is idle, unless a newer value replaces it first """
+        self.pushed += 1
+        self._value = value
+        self._deadline = time.perf_counter() + self.delay
+        if not self._waiting:
+            self._waiting = True
+            self._arm(self.delay)
+
+    def cancel(self) -> None:
+        """ Forget the pending value """
+        self._waiting = False
+        self._generation += 1
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _arm(self, delay: float) -> None:
+        if delay > 0:
+            self._timer = threading.Timer(delay, defer, (self._fire, self._generation))
+            self._timer.daemon = True
+            self._timer.start()
+        else:
+            defer(self._fire, self._generation)
+
+    def _fire(self, generation: int) -> None:
+        if not self._waiting or generation != self._generation:     # <- Ignore fires scheduled before a cancel
+            return
+        remaining = self._deadline - time.perf_counter()
+        if remaining > 0:                       # <- Updates came in meanwhile, wait for them to settle
+            self._arm(remaining)
+            return
+        self._waiting = False
+        self._timer = None
+        self.applied += 1
+        self.apply(self._value)
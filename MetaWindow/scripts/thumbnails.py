@@ -0,0 +1,165 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from backend import defer
+
+try:                    # <- Qt ships with maya, its image reader decodes and scales outside the ui thread
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImageReader
+except ImportError:
+    try:
+        from PySide2.QtCore import Qt
+        from PySide2.QtGui import QImageReader
+    except ImportError:
+        QImageReader = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def render(source: str, destination: str, size: int) -> None:
+    """ Decode the source image and write a png thumbnail fitting in a size x size square, it runs in a worker thread """
+    if QImageReader is not None:
+        reader = QImageReader(source)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid():
+            reader.setScaledSize(original.scaled(size, size, Qt.KeepAspectRatio))   # <- Scaled while decoding, the full image is never held
+        image = reader.read()
+        if image.isNull() or not image.save(destination, "PNG"):
+            raise OSError(f"Can't make a thumbnail of {source}: {reader.errorString()}")
+    elif Image is not None:
+        with Image.open(source) as image:
+            image.draft("RGB", (size, size))
+            image.thumbnail((size, size))
+            image.save(destination, "PNG")
+    else:
+        raise RuntimeError("Thumbnails need PySide or PIL")
+
+
+class ThumbnailCache:
+    """ This class makes thumbnails in a pool of worker threads and keeps them on disk, keyed by source path, mtime and size,
+        the least recently used thumbnails are evicted once the cache outgrows its byte budget """
+
+    def __init__(self, directory: str, max_bytes: int = 64 << 20, workers: int = 4, renderer=render) -> None:
+        self.directory = directory
+        """ Folder holding the thumbnail files """
+
+        self.max_bytes = max_bytes
+        """ Size budget of the thumbnail files, in bytes """
+
+        self.renderer = renderer
+        """ Function making a thumbnail, it receives the source path, the thumbnail path and the thumbnail size """
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "errors": 0}
+        """ How the requests were answered, and how many thumbnails were evicted """
+
+        self._entries = OrderedDict()       # <- Thumbnail file name to its size in bytes, least recently used first
+        self._bytes = 0
+        self._lock = threading.Condition()
+        self._pending = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+
+        os.makedirs(directory, exist_ok=True)
+        files = [entry for entry in os.scandir(directory) if entry.name.endswith(".png") and entry.is_file()]
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime_ns):
+            self._entries[entry.name] = entry.stat().st_size
+            self._bytes += entry.stat().st_size
+
+    def request(self, source: str, size: int, callback) -> None:
+        """ Get the thumbnail of the source image, the callback receives the thumbnail path on maya's idle queue once it is ready,
+            nothing is done on the calling thread, not even reading the source's mtime """
+        with self._lock:
+            callbacks = self._pending.get((source, size))
+            if callbacks is not None:           # <- Already on its way, another shelf showing the same file
+                callbacks.append(callback)
+                return
+            self._pending[(source, size)] = [callback]
+        self._pool.submit(self._make, source, size)
+
+    def _make(self, source: str, size: int) -> None:
+        try:
+            path = self._lookup(source, size)
+        except Exception:                       # <- Unreadable or missing source, the control keeps showing its text
+            path = None
+        with self._lock:
+            self.stats["errors"] += path is None
+            callbacks = self._pending.pop((source, size))
+            for callback in callbacks if path else ():
+                defer(callback, path)
+            self._lock.notify_all()
+
+    def _lookup(self, source: str, size: int) -> str:
+        status = os.stat(source)
+        name = hashlib.sha1(f"{os.path.abspath(source)}|{status.st_mtime_ns}|{status.st_size}|{size}".encode()).hexdigest() + ".png"
+        path = os.path.join(self.directory, name)
+
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+                self.stats["hits"] += 1
+                hit = True
+            else:
+                self.stats["misses"] += 1
+                hit = False
+        if hit:
+            try:
+                os.utime(path)                  # <- Keep the recency on disk, for the next sessions
+                return path
+            except OSError:                     # <- Removed behind our back, make it again
+                with self._lock:
+                    self._bytes -= self._entries.pop(name, 0)
+
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        self.renderer(source, temporary, size)
+        os.replace(temporary, path)             # <- Readers never see a half written thumbnail
+        self._store(name, os.path.getsize(path))
+        return path
+
+    def _store(self, name: str, size: int) -> None:
+        evicted = []
+        with self._lock:
+            self._bytes += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_name, old_size = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                evicted.append(old_name)
+            self.stats["evictions"] += len(evicted)
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.directory, old_name))
+            except OSError:
+                pass
+
+    def wait(self) -> None:
+        """ Block until every requested thumbnail is made, their callbacks are then waiting on the idle queue """
+        with self._lock:
+            self._lock.wait_for(lambda: not self._pending)
+
+    def clear(self) -> None:
+        """ Delete every thumbnail file """
+        with self._lock:
+            names, self._entries, self._bytes = list(self._entries), OrderedDict(), 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+cache: ThumbnailCache = globals().get("cache")
+""" Thumbnail cache shared by every shelf, None until the first request, it survives hot reloads so the worker threads are never duplicated """
+
+
+def request(source: str, size: int, callback) -> None:
+    """ Get the thumbnail of the source image through the shared cache, the cache folder is only created and scanned on the first request """
+    global cache
+    if cache is None:
+        cache = ThumbnailCache(os.path.join(tempfile.gettempdir(), "MetaWindow", "thumbnails"))
+    cache.request(source, size, callback)
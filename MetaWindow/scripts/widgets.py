@@ -1,7 +1,14 @@
-from maya import cmds
+from backend import cmds
 from color import *
 from engine import Widget, LabelStyle
-from maya.api.OpenMaya import MVector
+from scheduler import Throttle
+import lifecycle
+from index import SortedIndex, SearchIndex, Pager, ordered_diff
+import thumbnails
+from backend import MVector
+from arrays import BufferView
+import providers
+from array import array
 from functools import partial
 import os
 
@@ -25,7 +32,7 @@ class Toggle(Widget, T=bool):
         cmds.iconTextRadioCollection()
         true_element = cmds.iconTextRadioButton(
             st='textOnly', l=self.true_label, hlc=self.true_color.value, bgc=UI_Color.DARK_GRAY.value, font="smallFixedWidthFont", fla=False, select=default,
-            cc=lambda value, *_: setattr(*bind, value))
+            cc=lambda value, *_: bind.set(value))
         false_element = cmds.iconTextRadioButton(
             st='textOnly', l=self.false_label, hlc=self.false_color.value, bgc=UI_Color.DARK_GRAY.value, font="smallFixedWidthFont", fla=False, select=not default)
 
@@ -33,6 +40,11 @@ class Toggle(Widget, T=bool):
             (true_element, 'top', 0, 0),  (true_element, 'bottom', 0, 2),  (true_element, 'left', 4, 0),  (true_element, 'right', 1, 1),
             (false_element, 'top', 0, 0), (false_element, 'bottom', 0, 2), (false_element, 'left', 1, 1), (false_element, 'right', 3, 2)])
         cmds.setParent("..")
+        return true_element, false_element
+
+    def __update__(self, bind, controls):
+        true_element, false_element = controls
+        cmds.iconTextRadioButton(true_element if bind.get() else false_element, edit=True, select=True)
 
 
 class TextField(Widget, T=str):
@@ -41,33 +53,91 @@ class TextField(Widget, T=str):
     """
     def __widget__(self, bind, default):
         """ Create a text field widget """
-        event = lambda value, *_: setattr(*bind, value)
-        cmds.textField(text=default, tcc=event, cc=event, ec=event)
+        event = lambda value, *_: bind.set(value)
+        return cmds.textField(text=default, tcc=event, cc=event, ec=event)
+
+    def __update__(self, bind, controls):
+        cmds.textField(controls, edit=True, text=bind.get())
 
 
 class Dropdown(Widget, T=str):
     """ label = "" \n
         group = "" \n
-        choices = [str]
+        choices = [str] or provider \n
+        ttl = 0 \n
+        invalidate_on = ("SceneOpened", "NewSceneOpened")
     """
     choices = []
+    """ The choices, or a provider, a function returning them, it only runs once the menu is opened and its result is memoized """
+
+    ttl = 0
+    """ Seconds a provider's choices stay memoized, 0 keeps them until invalidated """
+
+    invalidate_on = ("SceneOpened", "NewSceneOpened")
+    """ Maya events invalidating a provider's choices """
 
     def __widget__(self, bind, default):
         """ Create a text field widget """
-        menu_element = cmds.optionMenu(changeCommand=lambda item, *_: setattr(*bind, item))
+        if callable(self.choices):
+            return self.provided_widget(bind, default)
+        menu_element = cmds.optionMenu(changeCommand=lambda item, *_: bind.set(item))
         for name in self.choices:
             cmds.menuItem(label=name)
         cmds.optionMenu(menu_element, edit=True, value=default)
+        return menu_element
+
+    def provided_widget(self, bind, default):
+        """ Create a dropdown listing a provider's choices, until first opened the menu only lists the current value,
+            so building it costs the same no matter how many choices there are """
+        provider = self.choices
+        providers.memo.invalidate_on(provider, self.invalidate_on)
+        shown = None        # <- The memoized choices the menu lists, None while it only lists the current value
+
+        def fill(items):
+            cmds.deleteUI(cmds.optionMenu(menu_element, query=True, itemListLong=True) or [])
+            for name in items:
+                cmds.menuItem(label=name, parent=menu_element)
+
+        def on_open(*_):
+            nonlocal shown
+            choices = providers.memo.get(provider, self.ttl)
+            if choices is not shown:            # <- Computed again since the menu was last filled
+                fill(choices)
+                shown = choices
+                if bind.get() in choices:
+                    cmds.optionMenu(menu_element, edit=True, value=bind.get())
+
+        def show(value):
+            nonlocal shown
+            if shown is not None and value in shown:
+                cmds.optionMenu(menu_element, edit=True, value=value)
+            else:
+                fill([value])
+                shown = None
+
+        menu_element = cmds.optionMenu(changeCommand=lambda item, *_: bind.set(item), postMenuCommand=on_open)
+        cmds.menuItem(label=bind.get())
+        return menu_element, show
+
+    def __update__(self, bind, controls):
+        if callable(self.choices):
+            _, show = controls
+            show(bind.get())
+        else:
+            cmds.optionMenu(controls, edit=True, value=bind.get())
 
 
 class AbstractSlider(Widget):
     """ label = "" \n
         group = "" \n
         min = 1 \n
-        max = 10
+        max = 10 \n
+        max_rate = 0
     """
     min = 1
     max = 10
+    max_rate = 0
+    """ Maximum drag updates applied per second, the newest value wins and the release value is always applied, 0 applies every drag tick """
 
     def abstract_slider(self, cmds_slider_func, cmds_field_func, bind, default) -> tuple[str, str]:
         """ Create an abstract slider widget, this method is supposed to be used through create_float_slider and create_int_slider """
@@ -75,14 +145,28 @@ class AbstractSlider(Widget):
         def on_update(value, *_):
             cmds_field_func(text_field_element, edit=True, value=round(float(value), 2))
             cmds_slider_func(slider_element, edit=True, value=round(float(value), 2))
-            setattr(*bind, value)
+            bind.set(value)
+
+        on_drag_update = on_update
+        if self.max_rate > 0:                   # <- Coalesce the drag ticks, the release and the field edits commit right away
+            throttle = Throttle(lifecycle.owned(on_update), self.max_rate)     # <- A tick still pending once the panel is released is dropped
+            on_drag_update = lambda value, *_: throttle.push(value)
+            on_update = lambda value, *_: throttle.commit(value)
 
         cmds.rowLayout(numberOfColumns=2, adjustableColumn2=2, columnWidth2=(35, 70), columnAlign2=["right", "left"], columnAttach2=["both", "right"])
         text_field_element = cmds_field_func(value=default, cc=on_update)
-        slider_element = cmds_slider_func(value=default, min=self.min, max=self.max, cc=on_update, dc=on_update)
+        slider_element = cmds_slider_func(value=default, min=self.min, max=self.max, cc=on_update, dc=on_drag_update)
         cmds.setParent("..")
         return text_field_element, slider_element
 
+    @staticmethod
+    def abstract_update(cmds_slider_func, cmds_field_func, bind, controls) -> None:
+        """ Push the bound value into an abstract slider widget's field and slider """
+        text_field_element, slider_element = controls
+        value = bind.get()
+        cmds_field_func(text_field_element, edit=True, value=value)
+        cmds_slider_func(slider_element, edit=True, value=value)
+
 
 class IntSlider(AbstractSlider, T=int):
     """ label = "" \n
@@ -91,7 +175,10 @@ class IntSlider(AbstractSlider, T=int):
         max = 10
     """
     def __widget__(self, bind, default):
-        super().abstract_slider(cmds.intSlider, cmds.intField, bind, default)
+        return super().abstract_slider(cmds.intSlider, cmds.intField, bind, default)
+
+    def __update__(self, bind, controls):
+        AbstractSlider.abstract_update(cmds.intSlider, cmds.intField, bind, controls)
 
 
 class FloatSlider(AbstractSlider, T=float):
@@ -103,38 +190,113 @@ class FloatSlider(AbstractSlider, T=float):
     def __widget__(self, bind, default):
         text_field_element, slider_element = super().abstract_slider(cmds.floatSlider, cmds.floatField, bind, default)
         cmds.floatField(text_field_element, edit=True, tze=False, value=default)
+        return text_field_element, slider_element
+
+    def __update__(self, bind, controls):
+        AbstractSlider.abstract_update(cmds.floatSlider, cmds.floatField, bind, controls)
 
 
 class StringBox(Widget, T=set[str], label_style=LabelStyle.Top):
     """ label = "" \n
         group = "" \n
         selection_type: str = transform \n
+        page_size: int = 0
     """
     selection_type = "transform"
+    page_size = 0
+    """ Show the items one page at a time, along with a search field, 0 shows every item in a single list """
+
+    @staticmethod
+    def _sync_widget(main_element, index, added=(), removed=()):
+        """ Apply a change to the list, only the added and removed entries are touched """
+        for position, item in index.insert(added):     # <- Only append the new entries, at their sorted position
+            cmds.textScrollList(main_element, edit=True, appendPosition=(position + 1, item))
+        removed = index.remove(removed)
+        if removed:
+            cmds.textScrollList(main_element, edit=True, removeItem=[item for _, item in removed])
+
+    def paged_widget(self, bind, default):
+        """ Create a string box showing a page of items at a time, searching and turning pages only touch the items on the page """
+        pager = Pager(SearchIndex(default), self.page_size)
+
+        def render():
+            window = pager.window()
+            first = pager.page * pager.page_size
+            cmds.textScrollList(main_element, edit=True, removeAll=True, append=window)
+            cmds.text(page_element, edit=True, label=f"{first + 1 if window else 0}-{first + len(window)} of {len(pager)}")
+
+        def on_search(query, *_):
+            pager.search(query)
+            render()
+
+        def on_turn(pages, *_):
+            pager.turn(pages)
+            render()
+
+        def on_add_btn_press(*_):
+            selection = cmds.ls(selection=True, type=self.selection_type)
+            if selection:
+                bind.set(bind.get().union(selection))
+                pager.index.insert(selection)
+                pager.refresh()
+                render()
+
+        def on_del_key_press(*_):
+            selection = cmds.textScrollList(main_element, query=True, selectItem=True)
+            if selection:
+                bind.set(bind.get().difference(selection))
+                pager.index.remove(selection)
+                pager.refresh()
+                render()
+
+        cmds.columnLayout(adjustableColumn=True)
+        cmds.textField(placeholderText="Search, end with * to match the start only", tcc=on_search)
+        main_element = cmds.textScrollList(allowMultiSelection=True, deleteKeyCommand=on_del_key_press)
+        cmds.rowLayout(numberOfColumns=4, adjustableColumn=2)
+        cmds.button(label="<", command=partial(on_turn, -1))
+        page_element = cmds.text(label="")
+        cmds.button(label=">", command=partial(on_turn, 1))
+        cmds.button(label="Add to List", command=on_add_btn_press)
+        cmds.setParent("..")
+        cmds.setParent("..")
+        render()
+        return main_element, pager, render
 
     def __widget__(self, bind, default):
-        def reset_widget(selection):
-            cmds.textScrollList(main_element, edit=True, removeAll=True)
-            cmds.textScrollList(main_element, edit=True, append=selection)
+        if self.page_size:
+            return self.paged_widget(bind, default)
+        index = SortedIndex(default)
 
         def on_add_btn_press(*_):
             selection = cmds.ls(selection=True, type=self.selection_type)
             if selection:
-                selection = getattr(*bind).union(selection)
-                setattr(*bind, selection)
-                reset_widget(selection)
+                bind.set(bind.get().union(selection))
+                StringBox._sync_widget(main_element, index, added=selection)
 
         def on_del_key_press(*_):
             selection = cmds.textScrollList(main_element, query=True, selectItem=True)
             if selection:
-                selection = getattr(*bind).difference(selection)
-                setattr(*bind, selection)
-                reset_widget(selection)
+                bind.set(bind.get().difference(selection))
+                StringBox._sync_widget(main_element, index, removed=selection)
 
         cmds.columnLayout(adjustableColumn=True)
-        main_element = cmds.textScrollList(allowMultiSelection=True, deleteKeyCommand=on_del_key_press, append=default)
+        main_element = cmds.textScrollList(allowMultiSelection=True, deleteKeyCommand=on_del_key_press, append=index.items)
         cmds.button(label="Add to List", command=on_add_btn_press)
         cmds.setParent("..")
+        return main_element, index
+
+    def __update__(self, bind, controls):
+        value = bind.get()
+        if self.page_size:
+            _, pager, render = controls
+            pager.index.insert([item for item in value if item not in pager.index])
+            pager.index.remove([item for item in pager.index.items if item not in value])
+            pager.refresh()
+            render()
+            return
+
+        main_element, index = controls
+        StringBox._sync_widget(main_element, index, added=[item for item in value if item not in index], removed=[item for item in index if item not in value])
 
 
 class MVecField(Widget, T=MVector):
@@ -143,64 +305,196 @@ class MVecField(Widget, T=MVector):
     """
     def __widget__(self, bind, default):
         def on_field_edited(value, index, *_):
-            getattr(*bind)[index] = value
+            vector = bind.get()
+            vector[index] = value
+            bind.set(vector)      # <- Write it back, so multi target binds propagate it
 
         cmds.rowLayout(nc=3, ct3=["left", "both", "right"])
-        [cmds.floatField(value=default[i], cc=partial(on_field_edited, index=i), tze=False) for i in range(3)]
+        field_elements = [cmds.floatField(value=default[i], cc=partial(on_field_edited, index=i), tze=False) for i in range(3)]
         cmds.setParent("..")
+        return field_elements
+
+    def __update__(self, bind, controls):
+        vector = bind.get()
+        for index, field_element in enumerate(controls):
+            cmds.floatField(field_element, edit=True, value=vector[index])
+
+
+class ArrayField(Widget, T=array, label_style=LabelStyle.Top):
+    """ label = "" \n
+        group = "" \n
+        page_size: int = 10 \n
+        min = 0.0 \n
+        max = 1.0
+    """
+    page_size = 10
+    """ Number of items shown at once, only their fields exist, turning pages edits them in place """
+
+    min = 0.0
+    max = 1.0
+    """ Bounds used by the clamp operation """
+
+    def __widget__(self, bind, default):
+        """ Create an array widget, it edits a buffer protocol object such as an array.array or a numpy array in place, a page of items at a time,
+            the bulk operations apply to the from/to item range """
+        view = BufferView(bind.get(), self.page_size)     # <- The bound buffer itself, edits land in it
+        cmds_field_func = cmds.intField if view.is_integer else cmds.floatField
+
+        def render():
+            first, values = view.window()
+            for slot, (index_element, field_element) in enumerate(rows):
+                visible = slot < len(values)
+                cmds.text(index_element, edit=True, label=str(first + slot), visible=visible)
+                cmds_field_func(field_element, edit=True, value=values[slot] if visible else 0, visible=visible)
+            cmds.text(page_element, edit=True, label=f"{first if len(view) else 0}-{first + len(values) - 1 if len(view) else 0} of {len(view)}")
+
+        def on_field_edited(value, slot, *_):
+            view[view.page * view.page_size + slot] = value
+            bind.set(view.buffer)       # <- Write it back, so observers and multi target binds see it
+
+        def on_turn(pages, *_):
+            view.turn(pages)
+            render()
+
+        def on_operation(operation, *_):
+            start = cmds.intField(start_element, query=True, value=True)
+            stop = cmds.intField(stop_element, query=True, value=True)
+            operand = cmds.floatField(operand_element, query=True, value=True)
+            stop = stop if stop > start else None       # <- An empty range runs to the end
+            if operation == "set":
+                view.set_range(operand, start, stop)
+            elif operation == "scale":
+                view.scale(operand, start, stop)
+            elif operation == "normalize":
+                view.normalize(start, stop)
+            else:
+                view.clamp(self.min, self.max, start, stop)
+            bind.set(view.buffer)
+            render()
+
+        cmds.columnLayout(adjustableColumn=True)
+        rows = []
+        for slot in range(self.page_size):
+            cmds.rowLayout(numberOfColumns=2, adjustableColumn2=2, columnWidth2=(45, 70), columnAlign2=["right", "left"])
+            rows.append((cmds.text(label=""), cmds_field_func(cc=partial(on_field_edited, slot=slot))))
+            cmds.setParent("..")
+
+        cmds.rowLayout(numberOfColumns=3, adjustableColumn3=2)
+        cmds.button(label="<", command=partial(on_turn, -1))
+        page_element = cmds.text(label="")
+        cmds.button(label=">", command=partial(on_turn, 1))
+        cmds.setParent("..")
+
+        cmds.rowLayout(numberOfColumns=7)
+        start_element = cmds.intField(value=0, min=0, annotation="First item of the range")
+        stop_element = cmds.intField(value=len(view), min=0, annotation="Item after the range, the range runs to the end if not after the first item")
+        operand_element = cmds.floatField(value=1.0, annotation="Value for set, factor for scale")
+        cmds.button(label="Set", command=partial(on_operation, "set"))
+        cmds.button(label="Scale", command=partial(on_operation, "scale"))
+        cmds.button(label="Normalize", command=partial(on_operation, "normalize"))
+        cmds.button(label="Clamp", command=partial(on_operation, "clamp"))
+        cmds.setParent("..")
+        cmds.setParent("..")
+        render()
+        return view, render
+
+    def __update__(self, bind, controls):
+        view, render = controls
+        buffer = bind.get()
+        if buffer is not view.buffer:       # <- A whole new buffer was assigned
+            view.rebind(buffer)
+        render()
 
 
 class ToggleShelf(Widget, T=dict[str, bool], label_style=LabelStyle.Top):
     """ label = "" \n
         group = "" \n
-        divisions:[int] = 2
+        divisions:[int] = 2 \n
+        preview = False \n
+        thumbnail_size = 64
     """
     divisions = 2
+    preview = False
+    """ Show a thumbnail of each file, thumbnails are made in worker threads and attached to the check boxes as they become ready """
 
-    @staticmethod
-    def _reset_widget(layout_element, data):
-        children = cmds.rowColumnLayout(layout_element, query=True, childArray=True)
-        if children:
-            cmds.deleteUI(children)
-        ToggleShelf._build_widget(layout_element, data)
+    thumbnail_size = 64
+    """ Size of the thumbnails' longest side, in pixels """
 
     @staticmethod
-    def _build_widget(layout_element, data):
-        def on_toggle(v, f, d, *_): d[f] = v
-        cmds.setParent(layout_element)
-        offsets = []
-        for index, file in enumerate(data.keys()):
-            cmds.iconTextCheckBox(st="textOnly", l=os.path.basename(file), v=data[file], marginWidth=5,
-                                  cc=partial(on_toggle, f=file, d=data), bgc=UI_Color.DARK_GRAY.value)
-            offsets.append((index+1, "both", 1))
-        cmds.rowColumnLayout(layout_element, edit=True, co=offsets)
+    def _sync_widget(layout_element, bind, controls, states, thumbnail_size=0):
+        """ Bring the shelf up to date with the bound data, only the removed, added and flipped entries are touched,
+            controls maps each file to its check box and states maps each file to the value its check box shows,
+            a thumbnail is requested for each added file if thumbnail_size is set """
+        def on_toggle(v, f, *_):
+            states[f] = v
+            d = bind.get()
+            d[f] = v
+            bind.set(d)
+
+        def on_thumbnail(f, control, image):
+            if controls.get(f) == control and cmds.iconTextCheckBox(control, exists=True):     # <- The file may be gone from the shelf by now
+                cmds.iconTextCheckBox(control, edit=True, image=image)
+
+        data = bind.get()
+        removed, added = ordered_diff(controls, data)
+
+        if removed:
+            cmds.deleteUI([controls.pop(file) for file in removed])
+            for file in removed:
+                del states[file]
+
+        for file, state in states.items():
+            if data[file] != state:
+                cmds.iconTextCheckBox(controls[file], edit=True, v=data[file])
+                states[file] = data[file]
+
+        if added:
+            cmds.setParent(layout_element)
+            offsets = []
+            for file in added:
+                controls[file] = cmds.iconTextCheckBox(st="iconAndTextVertical" if thumbnail_size else "textOnly", l=os.path.basename(file), v=data[file],
+                                                       marginWidth=5, cc=partial(on_toggle, f=file), bgc=UI_Color.DARK_GRAY.value)
+                states[file] = data[file]
+                if thumbnail_size:
+                    thumbnails.request(file, thumbnail_size, partial(on_thumbnail, file, controls[file]))
+                offsets.append((len(controls), "both", 1))
+            cmds.rowColumnLayout(layout_element, edit=True, co=offsets)
 
     @staticmethod
     def _add_elements(bind):
-        data = getattr(*bind)
+        data = bind.get()
         file_filter = 'Texture Files (*.jpg *.png *.tga *.tif);;All Files (*.*)'
         file_paths = cmds.fileDialog2(fileFilter=file_filter, dialogStyle=2, fileMode=4)
         if file_paths:
             for file in file_paths:
                 data.setdefault(file, False)
+            bind.set(data)
 
     @staticmethod
     def _remove_elements(bind):
-        setattr(*bind, {file: False for file, state in getattr(*bind).items() if not state})
+        bind.set({file: False for file, state in bind.get().items() if not state})
 
     def __widget__(self, bind, default):
+        controls, states = {}, {}
+        thumbnail_size = self.thumbnail_size if self.preview else 0
+
         def on_add_btn_press(*_):
             ToggleShelf._add_elements(bind)
-            ToggleShelf._reset_widget(layout_element, getattr(*bind))
+            ToggleShelf._sync_widget(layout_element, bind, controls, states, thumbnail_size)
 
         def on_remove_btn_press(*_):
             ToggleShelf._remove_elements(bind)
-            ToggleShelf._reset_widget(layout_element, getattr(*bind))
+            ToggleShelf._sync_widget(layout_element, bind, controls, states, thumbnail_size)
 
         layout_element = cmds.rowColumnLayout(numberOfColumns=self.divisions, adj=1)
-        ToggleShelf._build_widget(layout_element, getattr(*bind))
+        ToggleShelf._sync_widget(layout_element, bind, controls, states, thumbnail_size)
         cmds.setParent("..")
         cmds.rowLayout(numberOfColumns=2)
         cmds.button(label="Add Element", command=on_add_btn_press)
         cmds.button(label="Delete Selected Elements", command=on_remove_btn_press)
         cmds.setParent("..")
+        return layout_element, controls, states
+
+    def __update__(self, bind, controls):
+        layout_element, file_controls, states = controls
+        ToggleShelf._sync_widget(layout_element, bind, file_controls, states, self.thumbnail_size if self.preview else 0)